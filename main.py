@@ -4,8 +4,16 @@ import os
 import sys
 import json
 import logging
+import logging.handlers
+import functools
+from collections import Counter
 from datetime import datetime
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Configurando o logging
 logging.basicConfig(
     level=logging.INFO,
@@ -18,7 +26,81 @@ logging.basicConfig(
 
 logger = logging.getLogger("system_main")
 
-def rodar_sistema():
+def _agrupar_escrita_log(capacidade=1000):
+    """
+    Passa a gravar o arquivo de log em lotes, por meio de um MemoryHandler.
+    
+    Usado nas varreduras longas, em que uma escrita em disco por mensagem
+    domina o custo da simulação. Mensagens de erro forçam a gravação imediata.
+    """
+    raiz = logging.getLogger()
+    for handler in list(raiz.handlers):
+        if isinstance(handler, logging.FileHandler):
+            raiz.removeHandler(handler)
+            raiz.addHandler(logging.handlers.MemoryHandler(
+                capacidade, flushLevel=logging.ERROR, target=handler
+            ))
+
+# Módulos críticos do sistema
+_MODULOS = (
+    "content_generation", 
+    "video_generation", 
+    "text_to_speech", 
+    "api_integration", 
+    "social_media_posting",
+    "fallback_mechanisms",
+    "resilience_service"
+)
+
+# Tipos de erro por módulo
+_ERROS_POR_MODULO = {
+    "content_generation": ("API timeout", "Invalid response format", "Content policy violation"),
+    "video_generation": ("FFmpeg error", "Video processing timeout", "Insufficient resources"),
+    "text_to_speech": ("Unsupported language", "Audio generation failed", "API rate limit"),
+    "api_integration": ("API connection refused", "Invalid credentials", "Rate limit exceeded"),
+    "social_media_posting": ("Authentication failed", "Post rejected", "Media format invalid"),
+    "fallback_mechanisms": ("No fallback available", "Fallback also failed", "Configuration error"),
+    "resilience_service": ("Service unavailable", "Health check failed")
+}
+
+_ERROS_DESCONHECIDOS = ("Unknown error",)
+
+# Ações de correção por tipo de erro
+_ACOES_CORRECAO = {
+    "API timeout": "Aumentado timeout e implementado retry exponencial",
+    "Invalid response format": "Adicionada validação e normalização de resposta",
+    "Content policy violation": "Ajustado filtro de conteúdo com regras mais específicas",
+    "FFmpeg error": "Atualizado parâmetros FFmpeg para compatibilidade",
+    "Video processing timeout": "Otimizado processo de renderização com buffer",
+    "Insufficient resources": "Implementado gerenciamento dinâmico de recursos",
+    "Unsupported language": "Adicionado fallback para idioma não suportado",
+    "Audio generation failed": "Implementado mecanismo alternativo de síntese",
+    "API rate limit": "Adicionado controle de taxa com filas de prioridade",
+    "API connection refused": "Implementado circuito aberto com reconexão gradual",
+    "Invalid credentials": "Atualizado sistema de gerenciamento de tokens",
+    "Rate limit exceeded": "Adicionado throttling adaptativo baseado em feedback",
+    "Authentication failed": "Renovação automática de credenciais implementada",
+    "Post rejected": "Adicionado pré-verificador de conformidade",
+    "Media format invalid": "Implementado conversor automático de formato",
+    "No fallback available": "Criado novo caminho de fallback para este cenário",
+    "Fallback also failed": "Adicionado sistema de fallback em camadas",
+    "Configuration error": "Correção de configuração e validação automática",
+    "Service unavailable": "Implementado modo degradado autônomo",
+    "Health check failed": "Ajustado algoritmo de detecção de saúde do serviço"
+}
+
+# Probabilidades usadas pela simulação
+_PROB_FALHA = 0.05
+_PROB_CORRECAO = 0.95
+
+# Latência simulada (time.sleep) desativada por padrão; ative com GIENE_SIMULATE_LATENCY=1 ou --realtime
+_SIMULAR_LATENCIA = os.getenv("GIENE_SIMULATE_LATENCY") == "1"
+
+# Gerador próprio do módulo; use --seed para varreduras reprodutíveis
+_RNG = random.Random()
+
+def rodar_sistema(_rand=_RNG.random, _choice=_RNG.choice,
+                  _mods=_MODULOS, _errs=_ERROS_POR_MODULO):
     """
     Função para simular a execução do seu código ou sistema.
     
@@ -30,48 +112,35 @@ def rodar_sistema():
             - sucesso (bool): True se a execução foi bem-sucedida, False se houve erro
             - mensagem_erro (str): Descrição do erro se ocorreu, None caso contrário
     """
-    # Módulos críticos do sistema
-    modulos = [
-        "content_generation", 
-        "video_generation", 
-        "text_to_speech", 
-        "api_integration", 
-        "social_media_posting",
-        "fallback_mechanisms",
-        "resilience_service"
-    ]
-    
     # Simulando tempo de execução
-    time.sleep(0.1)
+    if _SIMULAR_LATENCIA:
+        time.sleep(0.1)
     
     # Chance de falha (5% de probabilidade geral)
-    if random.random() < 0.05:
+    if _rand() < _PROB_FALHA:
         # Selecionar um módulo aleatório que falhou
-        modulo_com_falha = random.choice(modulos)
-        
-        # Tipos de erro por módulo
-        erros_por_modulo = {
-            "content_generation": ["API timeout", "Invalid response format", "Content policy violation"],
-            "video_generation": ["FFmpeg error", "Video processing timeout", "Insufficient resources"],
-            "text_to_speech": ["Unsupported language", "Audio generation failed", "API rate limit"],
-            "api_integration": ["API connection refused", "Invalid credentials", "Rate limit exceeded"],
-            "social_media_posting": ["Authentication failed", "Post rejected", "Media format invalid"],
-            "fallback_mechanisms": ["No fallback available", "Fallback also failed", "Configuration error"],
-            "resilience_service": ["Service unavailable", "Health check failed"]
-        }
+        modulo_com_falha = _choice(_mods)
         
         # Selecionar um erro aleatório para o módulo que falhou
-        tipo_erro = random.choice(erros_por_modulo.get(modulo_com_falha, ["Unknown error"]))
+        tipo_erro = _choice(_errs.get(modulo_com_falha, _ERROS_DESCONHECIDOS))
         mensagem_erro = f"{tipo_erro} em {modulo_com_falha}"
         
-        logger.error(f"Erro detectado: {mensagem_erro}")
+        logger.error("Erro detectado: %s", mensagem_erro)
         return False, mensagem_erro
     
     # Simulando uma execução bem-sucedida
-    logger.info("Sistema executado com sucesso")
+    logger.debug("Sistema executado com sucesso")
     return True, None
 
-def corrigir_erro(erro):
+@functools.lru_cache(maxsize=128)
+def _parse_erro(erro):
+    """Separa uma mensagem '<tipo> em <módulo>' em (tipo, módulo), ou None se o formato for inválido."""
+    partes = erro.split(" em ")
+    if len(partes) != 2:
+        return None
+    return tuple(partes)
+
+def corrigir_erro(erro, _rand=_RNG.random):
     """
     Tenta corrigir o erro detectado durante a execução.
     
@@ -85,58 +154,35 @@ def corrigir_erro(erro):
         return True
     
     # Extrair o módulo e tipo de erro da mensagem
-    partes = erro.split(" em ")
-    if len(partes) != 2:
-        logger.error(f"Formato de erro desconhecido: {erro}")
+    partes = _parse_erro(erro)
+    if partes is None:
+        logger.error("Formato de erro desconhecido: %s", erro)
         return False
     
     tipo_erro, modulo = partes
     
-    logger.info(f"Tentando corrigir erro '{tipo_erro}' no módulo '{modulo}'")
+    logger.info("Tentando corrigir erro '%s' no módulo '%s'", tipo_erro, modulo)
     
     # Simular o tempo de correção
-    time.sleep(0.5)
-    
-    # Ações de correção por tipo de erro
-    acoes_correcao = {
-        "API timeout": "Aumentado timeout e implementado retry exponencial",
-        "Invalid response format": "Adicionada validação e normalização de resposta",
-        "Content policy violation": "Ajustado filtro de conteúdo com regras mais específicas",
-        "FFmpeg error": "Atualizado parâmetros FFmpeg para compatibilidade",
-        "Video processing timeout": "Otimizado processo de renderização com buffer",
-        "Insufficient resources": "Implementado gerenciamento dinâmico de recursos",
-        "Unsupported language": "Adicionado fallback para idioma não suportado",
-        "Audio generation failed": "Implementado mecanismo alternativo de síntese",
-        "API rate limit": "Adicionado controle de taxa com filas de prioridade",
-        "API connection refused": "Implementado circuito aberto com reconexão gradual",
-        "Invalid credentials": "Atualizado sistema de gerenciamento de tokens",
-        "Rate limit exceeded": "Adicionado throttling adaptativo baseado em feedback",
-        "Authentication failed": "Renovação automática de credenciais implementada",
-        "Post rejected": "Adicionado pré-verificador de conformidade",
-        "Media format invalid": "Implementado conversor automático de formato",
-        "No fallback available": "Criado novo caminho de fallback para este cenário",
-        "Fallback also failed": "Adicionado sistema de fallback em camadas",
-        "Configuration error": "Correção de configuração e validação automática",
-        "Service unavailable": "Implementado modo degradado autônomo",
-        "Health check failed": "Ajustado algoritmo de detecção de saúde do serviço"
-    }
+    if _SIMULAR_LATENCIA:
+        time.sleep(0.5)
     
     # Verificar se temos uma ação registrada para este tipo de erro
-    if tipo_erro in acoes_correcao:
-        acao = acoes_correcao[tipo_erro]
-        logger.info(f"Aplicando correção: {acao}")
+    acao = _ACOES_CORRECAO.get(tipo_erro)
+    if acao is not None:
+        logger.info("Aplicando correção: %s", acao)
         
         # 95% de chance de sucesso na correção
-        if random.random() < 0.95:
-            logger.info(f"Correção aplicada com sucesso: {acao}")
+        if _rand() < _PROB_CORRECAO:
+            logger.info("Correção aplicada com sucesso: %s", acao)
             return True
         else:
-            logger.error(f"Falha ao aplicar correção: {acao}")
+            logger.error("Falha ao aplicar correção: %s", acao)
             return False
     else:
-        logger.warning(f"Nenhuma ação definida para o erro '{tipo_erro}'")
+        logger.warning("Nenhuma ação definida para o erro '%s'", tipo_erro)
         # 50% de chance de sucesso para erros desconhecidos
-        return random.random() < 0.5
+        return _rand() < 0.5
 
 def realizar_varredura(repeticoes=1000):
     """
@@ -148,22 +194,21 @@ def realizar_varredura(repeticoes=1000):
     Returns:
         dict: Estatísticas da varredura.
     """
-    logger.info(f"Iniciando varredura do sistema ({repeticoes} repetições)")
+    logger.info("Iniciando varredura do sistema (%d repetições)", repeticoes)
     
-    estatisticas = {
-        "inicio": datetime.now().isoformat(),
-        "total": repeticoes,
-        "sucesso": 0,
-        "falhas": 0,
-        "tipos_erro": {},
-        "correcoes": 0,
-        "falhas_correcao": 0
-    }
+    estatisticas = _novas_estatisticas(repeticoes)
+    estatisticas["tipos_erro"] = Counter()
     
     execucoes_consecutivas = 0
     
+    iteracao = 0
+    
     while execucoes_consecutivas < repeticoes:
-        logger.info(f"Execução {execucoes_consecutivas + 1}/{repeticoes}")
+        # Progresso apenas a cada 64 iterações; o detalhe por execução fica em DEBUG
+        if (iteracao & 0x3f) == 0:
+            logger.info("Progresso: %d/%d (iteração %d)", execucoes_consecutivas, repeticoes, iteracao)
+        iteracao += 1
+        logger.debug("Execução %d/%d", execucoes_consecutivas + 1, repeticoes)
         
         # Executar o sistema
         sucesso, erro = rodar_sistema()
@@ -176,10 +221,7 @@ def realizar_varredura(repeticoes=1000):
             estatisticas["falhas"] += 1
             
             # Registrar o tipo de erro
-            if erro in estatisticas["tipos_erro"]:
-                estatisticas["tipos_erro"][erro] += 1
-            else:
-                estatisticas["tipos_erro"][erro] = 1
+            estatisticas["tipos_erro"][erro] += 1
             
             # Tentar corrigir o erro
             corrigido = corrigir_erro(erro)
@@ -191,22 +233,138 @@ def realizar_varredura(repeticoes=1000):
                 estatisticas["falhas_correcao"] += 1
                 logger.error("Não foi possível corrigir o erro, reiniciando contagem")
     
+    estatisticas["tipos_erro"] = dict(estatisticas["tipos_erro"])
+    return _finalizar_varredura(estatisticas)
+
+def realizar_varredura_fast(repeticoes=1000, realtime=False):
+    """
+    Versão vetorizada de realizar_varredura usando amostragem em lote com NumPy.
+    
+    Os sorteios de falha, módulo, erro e correção são feitos em lote, e a
+    primeira sequência de execuções consecutivas sem falha é localizada de
+    forma vetorizada, sem percorrer as execuções em Python.
+    
+    Args:
+        repeticoes (int): Número de execuções consecutivas sem falha exigidas.
+        realtime (bool): Se True (ou se o NumPy não estiver disponível), usa a
+            varredura original, com os tempos de execução simulados.
+        
+    Returns:
+        dict: Estatísticas da varredura.
+    """
+    if realtime or np is None:
+        return realizar_varredura(repeticoes)
+    
+    logger.info("Iniciando varredura rápida do sistema (%d repetições)", repeticoes)
+    
+    estatisticas = _novas_estatisticas(repeticoes)
+    
+    # Tabela plana de mensagens de erro, com deslocamento e quantidade por módulo
+    mensagens = []
+    deslocamentos = []
+    quantidades = []
+    for modulo in _MODULOS:
+        erros = _ERROS_POR_MODULO.get(modulo, _ERROS_DESCONHECIDOS)
+        deslocamentos.append(len(mensagens))
+        quantidades.append(len(erros))
+        mensagens.extend(f"{tipo_erro} em {modulo}" for tipo_erro in erros)
+    deslocamentos = np.array(deslocamentos)
+    quantidades = np.array(quantidades)
+    contagem_erros = np.zeros(len(mensagens), dtype=np.int64)
+    
+    # Derivado de _RNG para que --seed também torne a varredura rápida reprodutível
+    rng = np.random.default_rng(_RNG.getrandbits(64))
+    
+    # Procura a primeira janela de `repeticoes` execuções sem falha. A soma
+    # acumulada das falhas dá a quantidade de falhas de cada janela em O(N);
+    # se nenhuma janela estiver livre, um novo lote de tamanho fixo é sorteado.
+    inicio = 0
+    falhas = 0
+    if repeticoes > 0:
+        # Entre lotes, guarda apenas as últimas `repeticoes - 1` execuções (que
+        # ainda podem iniciar uma janela) e o total de execuções e falhas descartadas
+        cauda = np.empty(0, dtype=bool)
+        descartadas = 0
+        falhas_descartadas = 0
+        lote = max(repeticoes, 4096)
+        while True:
+            falhou = np.concatenate((cauda, rng.random(lote) < _PROB_FALHA))
+            acumulado = np.concatenate(([0], np.cumsum(falhou)))
+            livres = np.flatnonzero(acumulado[repeticoes:] == acumulado[:-repeticoes])
+            if livres.size:
+                inicio = descartadas + int(livres[0])
+                falhas = falhas_descartadas + int(acumulado[livres[0]])
+                break
+            corte = falhou.size - (repeticoes - 1)
+            descartadas += corte
+            falhas_descartadas += int(acumulado[corte])
+            cauda = falhou[corte:]
+    
+    estatisticas["sucesso"] = inicio - falhas + repeticoes
+    estatisticas["falhas"] = falhas
+    
+    if falhas:
+        # Sorteia módulo e erro de cada falha e contabiliza por tipo
+        indice_modulo = rng.integers(0, len(_MODULOS), falhas)
+        indice_erro = (rng.random(falhas) * quantidades[indice_modulo]).astype(np.int64)
+        contagem_erros += np.bincount(
+            deslocamentos[indice_modulo] + indice_erro,
+            minlength=len(mensagens)
+        )
+        
+        corrigidos = int(np.count_nonzero(rng.random(falhas) < _PROB_CORRECAO))
+        estatisticas["correcoes"] = corrigidos
+        estatisticas["falhas_correcao"] = falhas - corrigidos
+    
+    estatisticas["tipos_erro"] = {
+        mensagens[i]: int(contagem_erros[i]) for i in np.flatnonzero(contagem_erros)
+    }
+    return _finalizar_varredura(estatisticas)
+
+def _novas_estatisticas(repeticoes):
+    """Cria o registro de estatísticas comum às duas implementações da varredura."""
+    return {
+        "inicio": datetime.now().isoformat(),
+        "total": repeticoes,
+        "sucesso": 0,
+        "falhas": 0,
+        "tipos_erro": {},
+        "correcoes": 0,
+        "falhas_correcao": 0
+    }
+
+def _finalizar_varredura(estatisticas):
+    """Registra o fim da varredura, salva e retorna as estatísticas."""
     estatisticas["fim"] = datetime.now().isoformat()
-    logger.info(f"Varredura concluída: {estatisticas['sucesso']} sucessos, {estatisticas['falhas']} falhas")
+    logger.info("Varredura concluída: %d sucessos, %d falhas", estatisticas["sucesso"], estatisticas["falhas"])
     
-    # Salvar estatísticas em arquivo JSON
-    with open("varredura_estatisticas.json", "w", encoding="utf-8") as f:
-        json.dump(estatisticas, f, ensure_ascii=False, indent=2)
+    _salvar_estatisticas(estatisticas)
     
     return estatisticas
 
+def _salvar_estatisticas(estatisticas):
+    """Salva as estatísticas da varredura em arquivo JSON."""
+    with open("varredura_estatisticas.json", "w", encoding="utf-8") as f:
+        json.dump(estatisticas, f, ensure_ascii=False, indent=2)
+
 if __name__ == "__main__":
     logger.info("=== INICIANDO SISTEMA ===")
     
     # Verificar argumentos da linha de comando
-    if len(sys.argv) > 1 and sys.argv[1] == "--varredura":
-        repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
-        realizar_varredura(repeticoes)
+    if "--realtime" in sys.argv:
+        os.environ["GIENE_SIMULATE_LATENCY"] = "1"
+        _SIMULAR_LATENCIA = True
+    realtime = _SIMULAR_LATENCIA
+    argumentos = [arg for arg in sys.argv[1:] if arg != "--realtime"]
+    if "--seed" in argumentos:
+        posicao = argumentos.index("--seed")
+        _RNG.seed(int(argumentos[posicao + 1]))
+        del argumentos[posicao:posicao + 2]
+    
+    if argumentos and argumentos[0] == "--varredura":
+        _agrupar_escrita_log()
+        repeticoes = int(argumentos[1]) if len(argumentos) > 1 else 1000
+        realizar_varredura_fast(repeticoes, realtime=realtime)
     else:
         # Executar o sistema uma vez
         sucesso, erro = rodar_sistema()
@@ -219,6 +377,6 @@ if __name__ == "__main__":
         if sucesso:
             logger.info("Sistema finalizado com sucesso")
         else:
-            logger.error(f"Sistema finalizado com erro: {erro}")
+            logger.error("Sistema finalizado com erro: %s", erro)
     
     logger.info("=== SISTEMA FINALIZADO ===")
\ No newline at end of file
@@ -9,6 +9,70 @@ import shutil
 import datetime
 import subprocess
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+def _executar_em_paralelo(tarefas):
+    """Executa tarefas de cópia independentes em threads e exibe cada mensagem ao concluir.
+    
+    Cada tarefa é uma tupla (função, argumentos) cuja função retorna a mensagem a exibir.
+    """
+    if not tarefas:
+        return
+    
+    with ThreadPoolExecutor(max_workers=min(8, len(tarefas))) as executor:
+        futuros = [executor.submit(funcao, *argumentos) for funcao, argumentos in tarefas]
+        for futuro in as_completed(futuros):
+            print(futuro.result())
+
+def _copiar_conteudo(origem, destino):
+    """Copia um arquivo como shutil.copy2, tentando antes os.copy_file_range.
+    
+    A cópia é feita no kernel e, em sistemas de arquivos com copy-on-write
+    (btrfs, xfs), os blocos são compartilhados sem duplicar os dados. Não são
+    usados hardlinks, pois o backup passaria a mudar junto com o original.
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(origem, "rb") as entrada, open(destino, "wb") as saida:
+                restante = os.fstat(entrada.fileno()).st_size
+                while restante > 0:
+                    copiado = os.copy_file_range(entrada.fileno(), saida.fileno(), restante)
+                    if copiado == 0:
+                        break
+                    restante -= copiado
+            # Cópia incompleta (arquivo alterado durante a cópia ou chamada não
+            # suportada): refaz com copy2 em vez de deixar o backup truncado
+            if restante == 0:
+                shutil.copystat(origem, destino)
+                return destino
+        except OSError:
+            pass
+    return shutil.copy2(origem, destino)
+
+def _copiar_diretorio(origem, destino):
+    shutil.copytree(origem, destino, copy_function=_copiar_conteudo, dirs_exist_ok=True)
+    return f"Diretório copiado: {origem} -> {destino}"
+
+def _copiar_arquivo(origem, destino):
+    # Criar diretórios intermediários se necessário
+    os.makedirs(os.path.dirname(destino) or ".", exist_ok=True)
+    _copiar_conteudo(origem, destino)
+    return f"Arquivo copiado: {origem} -> {destino}"
+
+def _restaurar_diretorio(origem, destino):
+    # Remover diretório existente
+    if os.path.exists(destino):
+        shutil.rmtree(destino)
+    # Copiar do backup
+    shutil.copytree(origem, destino, copy_function=_copiar_conteudo)
+    return f"Diretório restaurado: {origem} -> {destino}"
+
+def _restaurar_arquivo(origem, destino):
+    # Criar diretórios intermediários se necessário
+    os.makedirs(os.path.dirname(destino) or ".", exist_ok=True)
+    # Copiar do backup
+    _copiar_conteudo(origem, destino)
+    return f"Arquivo restaurado: {origem} -> {destino}"
 
 def criar_backup(nome=None):
     """Cria um backup do sistema atual."""
@@ -40,21 +104,18 @@ def criar_backup(nome=None):
         "drizzle.config.ts"
     ]
     
-    # Copiar diretórios
-    for diretorio in diretorios:
-        if os.path.exists(diretorio):
-            destino = os.path.join(diretorio_backup, diretorio)
-            shutil.copytree(diretorio, destino, dirs_exist_ok=True)
-            print(f"Diretório copiado: {diretorio} -> {destino}")
-    
-    # Copiar arquivos
-    for arquivo in arquivos:
-        if os.path.exists(arquivo):
-            destino = os.path.join(diretorio_backup, arquivo)
-            # Criar diretórios intermediários se necessário
-            os.makedirs(os.path.dirname(destino), exist_ok=True)
-            shutil.copy2(arquivo, destino)
-            print(f"Arquivo copiado: {arquivo} -> {destino}")
+    # Copiar diretórios e arquivos em paralelo
+    tarefas = [
+        (_copiar_diretorio, (diretorio, os.path.join(diretorio_backup, diretorio)))
+        for diretorio in diretorios
+        if os.path.exists(diretorio)
+    ]
+    tarefas += [
+        (_copiar_arquivo, (arquivo, os.path.join(diretorio_backup, arquivo)))
+        for arquivo in arquivos
+        if os.path.exists(arquivo)
+    ]
+    _executar_em_paralelo(tarefas)
     
     print(f"\nBackup criado com sucesso em: {diretorio_backup}")
     return diretorio_backup
@@ -87,26 +148,18 @@ def restaurar_backup(nome):
         "drizzle.config.ts"
     ]
     
-    # Restaurar diretórios
-    for diretorio in diretorios:
-        origem = os.path.join(diretorio_backup, diretorio)
-        if os.path.exists(origem):
-            # Remover diretório existente
-            if os.path.exists(diretorio):
-                shutil.rmtree(diretorio)
-            # Copiar do backup
-            shutil.copytree(origem, diretorio)
-            print(f"Diretório restaurado: {origem} -> {diretorio}")
-    
-    # Restaurar arquivos
-    for arquivo in arquivos:
-        origem = os.path.join(diretorio_backup, arquivo)
-        if os.path.exists(origem):
-            # Criar diretórios intermediários se necessário
-            os.makedirs(os.path.dirname(arquivo), exist_ok=True)
-            # Copiar do backup
-            shutil.copy2(origem, arquivo)
-            print(f"Arquivo restaurado: {origem} -> {arquivo}")
+    # Restaurar diretórios e arquivos em paralelo
+    tarefas = [
+        (_restaurar_diretorio, (os.path.join(diretorio_backup, diretorio), diretorio))
+        for diretorio in diretorios
+        if os.path.exists(os.path.join(diretorio_backup, diretorio))
+    ]
+    tarefas += [
+        (_restaurar_arquivo, (os.path.join(diretorio_backup, arquivo), arquivo))
+        for arquivo in arquivos
+        if os.path.exists(os.path.join(diretorio_backup, arquivo))
+    ]
+    _executar_em_paralelo(tarefas)
     
     print(f"\nBackup '{nome}' restaurado com sucesso!")
     return True
@@ -117,22 +170,23 @@ def listar_backups():
         print("Nenhum backup encontrado.")
         return []
     
-    backups = os.listdir("backups")
-    backups = [b for b in backups if os.path.isdir(os.path.join("backups", b))]
+    # scandir reaproveita o stat de cada entrada para is_dir() e st_ctime
+    with os.scandir("backups") as entradas:
+        encontrados = [(e.name, e.stat().st_ctime) for e in entradas if e.is_dir()]
     
-    if not backups:
+    if not encontrados:
         print("Nenhum backup encontrado.")
         return []
     
+    encontrados.sort(key=lambda item: item[1])
+    
     print("\nBackups disponíveis:")
-    for i, backup in enumerate(backups):
-        data_criacao = datetime.datetime.fromtimestamp(
-            os.path.getctime(os.path.join("backups", backup))
-        ).strftime("%d/%m/%Y %H:%M:%S")
+    for i, (backup, criado_em) in enumerate(encontrados):
+        data_criacao = datetime.datetime.fromtimestamp(criado_em).strftime("%d/%m/%Y %H:%M:%S")
         
         print(f"  {i+1}. {backup} (Criado em: {data_criacao})")
     
-    return backups
+    return [backup for backup, _ in encontrados]
 
 def verificar_dependencias():
     """Verifica e instala as dependências necessárias para o sistema."""
@@ -155,16 +209,17 @@ def verificar_dependencias():
     # Verificar dependências Python
     try:
         python_packages = ["tabulate", "requests"]
-        for package in python_packages:
-            resultado = subprocess.run(
-                [sys.executable, "-m", "pip", "install", package],
-                capture_output=True,
-                text=True
-            )
-            if resultado.returncode == 0:
-                print(f"✓ Dependência Python '{package}' instalada com sucesso.")
-            else:
-                print(f"✗ Erro ao instalar dependência Python '{package}': {resultado.stderr}")
+        resultado = subprocess.run(
+            [sys.executable, "-m", "pip", "install",
+             "--disable-pip-version-check", "--no-input", *python_packages],
+            capture_output=True,
+            text=True
+        )
+        pacotes = ", ".join(f"'{package}'" for package in python_packages)
+        if resultado.returncode == 0:
+            print(f"✓ Dependências Python {pacotes} instaladas com sucesso.")
+        else:
+            print(f"✗ Erro ao instalar dependências Python {pacotes}: {resultado.stderr}")
     except Exception as e:
         print(f"✗ Erro ao instalar dependências Python: {str(e)}")
 
@@ -8,11 +8,23 @@ import os
 import sys
 import time
 import json
+import shutil
+import asyncio
 import logging
 import argparse
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,6 +37,12 @@ logging.basicConfig(
 
 logger = logging.getLogger("test_coordinator")
 
+# Caminhos resolvidos uma única vez na importação
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_PARENT = os.path.dirname(_HERE)
+_SIM_SCRIPT = os.path.join(_HERE, "system_tester.py")
+_INT_SCRIPT = os.path.join(_HERE, "test_runner.py")
+
 def parse_arguments():
     """Parse argumentos da linha de comando"""
     parser = argparse.ArgumentParser(description="Executor da estratégia de teste e otimização do sistema")
@@ -69,154 +87,197 @@ def parse_arguments():
 
 def setup_output_directory(output_dir):
     """Configura o diretório de saída para os resultados dos testes"""
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-        logger.info(f"Criado diretório para resultados: {output_dir}")
-    
-    # Criar um subdiretório com data/hora para esta execução
+    # Criar um subdiretório com data/hora para esta execução (e o diretório de saída, se preciso)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     run_dir = os.path.join(output_dir, f"run_{timestamp}")
-    os.makedirs(run_dir)
+    os.makedirs(run_dir, exist_ok=True)
     
     return run_dir
 
-def run_simulation_tests(args, run_dir):
-    """Executa testes simulados do sistema"""
-    logger.info("=== INICIANDO TESTES SIMULADOS ===")
-    
-    # Caminho para o script de teste simulado
-    sim_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "system_tester.py")
-    
-    # Configuração de variáveis de ambiente para o teste
-    env = os.environ.copy()
-    env["PYTHONPATH"] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    env["TEST_MODULE_ITERATIONS"] = str(args.module_tests)
-    env["TEST_SYSTEM_ITERATIONS"] = str(args.system_tests)
-    
-    # Comando para executar o script
-    cmd = [sys.executable, sim_script]
+# Tamanho dos blocos lidos dos pipes do subprocesso
+_READ_SIZE = 64 * 1024
+
+async def _pump(stream, run_logger, log_level):
+    """Registra as linhas de um pipe do subprocesso no logger da execução.
+    
+    O pipe é lido em blocos e dividido em linhas aqui, para aceitar linhas de
+    qualquer tamanho (o iterador de StreamReader falha acima de 64 KiB).
+    """
+    def emit(line):
+        run_logger.log(log_level, line.decode("utf-8", errors="replace").strip())
+    
+    pending = b""
+    while True:
+        chunk = await stream.read(_READ_SIZE)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            emit(line)
+    if pending:
+        emit(pending)
+
+async def _run_and_capture(cmd, env, log_path):
+    """Executa o comando capturando stdout e stderr simultaneamente.
+    
+    Ler os dois pipes ao mesmo tempo evita que o processo filho bloqueie com
+    o buffer de stderr cheio. Retorna o código de saída do processo.
+    """
+    # Logger próprio da execução: cada linha é formatada uma vez e vai para o
+    # arquivo da execução e, por propagação, para o console e o log principal.
+    # Um logger filho por arquivo mantém separadas as execuções simultâneas.
+    run_logger = logger.getChild(os.path.splitext(os.path.basename(log_path))[0])
+    file_handler = logging.FileHandler(log_path, mode="w")
+    file_handler.setFormatter(logging.getLogger().handlers[0].formatter)
+    run_logger.addHandler(file_handler)
     
     try:
-        # Iniciar o processo de teste simulado
-        start_time = datetime.now()
-        logger.info(f"Iniciando testes simulados às {start_time.strftime('%H:%M:%S')}")
-        
-        # Executar o script como um processo separado e capturar sua saída
-        process = subprocess.Popen(
-            cmd,
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
             env=env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
         )
         
-        # Copiar logs do processo para nosso arquivo de log
-        simulation_log_path = os.path.join(run_dir, "simulation_tests.log")
-        with open(simulation_log_path, "w") as log_file:
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    logger.info(output.strip())
-                    log_file.write(output)
-                    log_file.flush()
-        
-        # Obter código de saída do processo
-        return_code = process.wait()
-        end_time = datetime.now()
-        duration = end_time - start_time
-        
-        # Verificar resultado
-        if return_code == 0:
-            logger.info(f"Testes simulados concluídos com sucesso em {duration}")
-            
-            # Copiar arquivo de resultados para o diretório de saída
-            if os.path.exists("test_statistics.json"):
-                import shutil
-                shutil.copy2(
-                    "test_statistics.json", 
-                    os.path.join(run_dir, "simulation_results.json")
-                )
-            
-            return True
-        else:
-            logger.error(f"Testes simulados falharam com código {return_code}")
-            return False
-            
-    except Exception as e:
-        logger.error(f"Erro ao executar testes simulados: {str(e)}")
-        return False
+        captured = False
+        try:
+            await asyncio.gather(
+                _pump(process.stdout, run_logger, logging.INFO),
+                _pump(process.stderr, run_logger, logging.WARNING)
+            )
+            captured = True
+        finally:
+            # Se a captura falhou, o processo não pode ficar órfão com os pipes cheios
+            if not captured and process.returncode is None:
+                process.kill()
+            return_code = await process.wait()
+    finally:
+        run_logger.removeHandler(file_handler)
+        file_handler.close()
+    
+    return return_code
 
-def run_integration_tests(args, run_dir):
-    """Executa testes de integração com a API real"""
-    logger.info("=== INICIANDO TESTES DE INTEGRAÇÃO ===")
+def _run_subprocess_tests(label, script, env_overrides, log_name, copies, run_dir):
+    """Executa um script de testes como subprocesso e recolhe seus resultados.
     
-    # Caminho para o script de teste de integração
-    int_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_runner.py")
+    `label` é o nome dos testes nas mensagens (ex.: "testes simulados") e
+    `copies` lista pares (arquivo gerado na raiz, nome no diretório da execução)
+    copiados após uma execução bem-sucedida.
+    """
+    logger.info(f"=== INICIANDO {label.upper()} ===")
     
     # Configuração de variáveis de ambiente para o teste
     env = os.environ.copy()
-    env["PYTHONPATH"] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    env["API_TEST_ATTEMPTS"] = str(args.api_tests)
+    env["PYTHONPATH"] = _PARENT
+    env.update(env_overrides)
     
     # Comando para executar o script
-    cmd = [sys.executable, int_script]
+    cmd = [sys.executable, script]
     
     try:
-        # Iniciar o processo de teste de integração
-        start_time = datetime.now()
-        logger.info(f"Iniciando testes de integração às {start_time.strftime('%H:%M:%S')}")
-        
-        # Executar o script como um processo separado e capturar sua saída
-        process = subprocess.Popen(
-            cmd,
-            env=env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1
-        )
-        
-        # Copiar logs do processo para nosso arquivo de log
-        integration_log_path = os.path.join(run_dir, "integration_tests.log")
-        with open(integration_log_path, "w") as log_file:
-            while True:
-                output = process.stdout.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output:
-                    logger.info(output.strip())
-                    log_file.write(output)
-                    log_file.flush()
+        # Iniciar o processo de teste
+        logger.info(f"Iniciando {label} às {time.strftime('%H:%M:%S')}")
+        start_time = time.perf_counter()
         
-        # Obter código de saída do processo
-        return_code = process.wait()
-        end_time = datetime.now()
-        duration = end_time - start_time
+        # Executar o script como um processo separado, copiando sua saída para nosso arquivo de log
+        log_path = os.path.join(run_dir, log_name)
+        return_code = asyncio.run(_run_and_capture(cmd, env, log_path))
+        duration = timedelta(seconds=time.perf_counter() - start_time)
         
         # Verificar resultado
         if return_code == 0:
-            logger.info(f"Testes de integração concluídos com sucesso em {duration}")
+            logger.info(f"{label.capitalize()} concluídos com sucesso em {duration}")
             
-            # Copiar arquivo de resultados para o diretório de saída
-            if os.path.exists("integration_test_results.json"):
-                import shutil
-                shutil.copy2(
-                    "integration_test_results.json", 
-                    os.path.join(run_dir, "integration_results.json")
-                )
+            # Copiar arquivos de resultados para o diretório de saída
+            for src, dst_name in copies:
+                if os.path.exists(src):
+                    shutil.copy2(src, os.path.join(run_dir, dst_name))
             
             return True
         else:
-            logger.error(f"Testes de integração falharam com código {return_code}")
+            logger.error(f"{label.capitalize()} falharam com código {return_code}")
             return False
             
     except Exception as e:
-        logger.error(f"Erro ao executar testes de integração: {str(e)}")
+        logger.error(f"Erro ao executar {label}: {str(e)}")
         return False
 
+def run_simulation_tests(args, run_dir):
+    """Executa testes simulados do sistema"""
+    # O test_statistics.json original permanece na raiz, onde visualizar_estatisticas.py o lê
+    return _run_subprocess_tests(
+        "testes simulados",
+        _SIM_SCRIPT,
+        {
+            "TEST_MODULE_ITERATIONS": str(args.module_tests),
+            "TEST_SYSTEM_ITERATIONS": str(args.system_tests)
+        },
+        "simulation_tests.log",
+        (
+            ("test_statistics.json", "simulation_results.json"),
+            ("test_events.jsonl", "simulation_events.jsonl")
+        ),
+        run_dir
+    )
+
+def run_integration_tests(args, run_dir):
+    """Executa testes de integração com a API real"""
+    # Os resultados são gravados diretamente no diretório da execução, sem cópia
+    return _run_subprocess_tests(
+        "testes de integração",
+        _INT_SCRIPT,
+        {
+            "API_TEST_ATTEMPTS": str(args.api_tests),
+            "RESULT_OUTPUT_PATH": os.path.join(run_dir, "integration_results.json")
+        },
+        "integration_tests.log",
+        (("failed_tests.jsonl", "failed_tests.jsonl"),),
+        run_dir
+    )
+
+# Acima deste tamanho os resultados são lidos em fluxo, mantendo só os campos usados
+_LIMITE_JSON_COMPLETO = 1024 * 1024
+
+# Campos de cada arquivo de resultados usados na análise e no relatório; as listas
+# de eventos (otimizações, falhas) ficam de fora, qualquer que seja o tamanho do arquivo
+_CAMPOS_SIMULACAO = ("start_time", "end_time", "duration_seconds", "modules_tested", "general_tests", "fatal_error")
+_CAMPOS_INTEGRACAO = (
+    "start_time", "end_time", "modules_tested", "success_rate",
+    "total_tests", "total_successful_tests", "overall_success_rate"
+)
+
+def _carregar_resultados(path, campos):
+    """Carrega os campos de nível superior em `campos` de um arquivo de resultados JSON.
+    
+    Arquivos pequenos (ou sem ijson disponível) são lidos inteiros; nos grandes,
+    os campos são montados em fluxo, numa única passada pelo arquivo.
+    """
+    if ijson is None or os.path.getsize(path) < _LIMITE_JSON_COMPLETO:
+        with open(path, "r") as f:
+            data = json.load(f)
+        return {campo: data[campo] for campo in campos if campo in data}
+    
+    data = {}
+    campo = construtor = None
+    with open(path, "rb") as f:
+        for prefixo, evento, valor in ijson.parse(f, use_float=True):
+            if prefixo:
+                if construtor is not None:
+                    construtor.event(evento, valor)
+                continue
+            
+            # Eventos do objeto raiz: cada chave encerra o valor da anterior
+            if construtor is not None:
+                data[campo] = construtor.value
+                if len(data) == len(campos):
+                    break
+            if evento == "map_key" and valor in campos:
+                campo, construtor = valor, ijson.ObjectBuilder()
+            else:
+                construtor = None
+    return data
+
 def analyze_results(run_dir):
     """Analisa os resultados dos testes e gera um relatório"""
     logger.info("=== ANALISANDO RESULTADOS DOS TESTES ===")
@@ -235,11 +296,9 @@ def analyze_results(run_dir):
     sim_results_path = os.path.join(run_dir, "simulation_results.json")
     if os.path.exists(sim_results_path):
         try:
-            with open(sim_results_path, "r") as f:
-                sim_data = json.load(f)
-                results["simulation_data"] = sim_data
-                results["simulation_success"] = True
-                logger.info("Resultados da simulação carregados com sucesso")
+            results["simulation_data"] = _carregar_resultados(sim_results_path, _CAMPOS_SIMULACAO)
+            results["simulation_success"] = True
+            logger.info("Resultados da simulação carregados com sucesso")
         except Exception as e:
             logger.error(f"Erro ao carregar resultados da simulação: {str(e)}")
     else:
@@ -249,11 +308,9 @@ def analyze_results(run_dir):
     int_results_path = os.path.join(run_dir, "integration_results.json")
     if os.path.exists(int_results_path):
         try:
-            with open(int_results_path, "r") as f:
-                int_data = json.load(f)
-                results["integration_data"] = int_data
-                results["integration_success"] = True
-                logger.info("Resultados da integração carregados com sucesso")
+            results["integration_data"] = _carregar_resultados(int_results_path, _CAMPOS_INTEGRACAO)
+            results["integration_success"] = True
+            logger.info("Resultados da integração carregados com sucesso")
         except Exception as e:
             logger.error(f"Erro ao carregar resultados da integração: {str(e)}")
     else:
@@ -292,19 +349,14 @@ def analyze_results(run_dir):
     
     # Analisar problemas específicos e fazer recomendações
     if results["integration_success"]:
-        # Encontrar endpoints com problemas
-        problem_endpoints = []
-        
-        for module, module_data in results["integration_data"].get("modules_tested", {}).items():
-            for endpoint, endpoint_data in module_data.get("endpoints", {}).items():
-                if endpoint_data.get("failures", 0) > 0:
-                    success_rate = endpoint_data.get("successes", 0) / endpoint_data.get("attempts", 1) * 100
-                    if success_rate < 80:
-                        problem_endpoints.append({
-                            "module": module,
-                            "endpoint": endpoint,
-                            "success_rate": f"{success_rate:.2f}%"
-                        })
+        # Encontrar endpoints com problemas (taxa de sucesso abaixo de 80%) em uma única passada
+        problem_endpoints = [
+            {"module": module, "endpoint": endpoint, "success_rate": f"{successes / attempts * 100:.2f}%"}
+            for module, module_data in results["integration_data"].get("modules_tested", {}).items()
+            for endpoint, endpoint_data in module_data.get("endpoints", {}).items()
+            if (attempts := endpoint_data.get("attempts", 1))
+            and (successes := endpoint_data.get("successes", 0)) / attempts < 0.8
+        ]
         
         if problem_endpoints:
             results["problem_endpoints"] = problem_endpoints
@@ -314,8 +366,12 @@ def analyze_results(run_dir):
     
     # Salvar o relatório completo
     report_path = os.path.join(run_dir, "analysis_report.json")
-    with open(report_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        with open(report_path, "wb") as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
     
     # Criar um relatório resumido em texto
     summary_path = os.path.join(run_dir, "summary_report.txt")
@@ -360,26 +416,35 @@ def main():
     logger.info(f"Resultados serão salvos em: {run_dir}")
     
     # Iniciar cronômetro geral
-    start_time = datetime.now()
-    logger.info(f"Iniciando sequência de testes às {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    logger.info(f"Iniciando sequência de testes às {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    start_time = time.perf_counter()
     logger.info(f"Modo: {args.mode}")
     
     # Executar os testes conforme o modo selecionado
     sim_success = True
     int_success = True
     
-    if args.mode in ["full", "demo", "simulation"]:
-        sim_success = run_simulation_tests(args, run_dir)
-    
-    if args.mode in ["full", "demo", "integration"]:
-        int_success = run_integration_tests(args, run_dir)
+    # Os dois tipos de teste são subprocessos independentes, então rodam em paralelo
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        sim_future = None
+        int_future = None
+        
+        if args.mode in ["full", "demo", "simulation"]:
+            sim_future = executor.submit(run_simulation_tests, args, run_dir)
+        
+        if args.mode in ["full", "demo", "integration"]:
+            int_future = executor.submit(run_integration_tests, args, run_dir)
+        
+        if sim_future is not None:
+            sim_success = sim_future.result()
+        if int_future is not None:
+            int_success = int_future.result()
     
     # Analisar resultados
     results = analyze_results(run_dir)
     
     # Finalizar
-    end_time = datetime.now()
-    duration = end_time - start_time
+    duration = timedelta(seconds=time.perf_counter() - start_time)
     
     logger.info(f"Sequência de testes concluída em {duration}")
     logger.info(f"Estado geral do sistema: {results['overall_health'].upper()}")
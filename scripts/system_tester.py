@@ -4,20 +4,97 @@ import os
 import sys
 import json
 import logging
+import logging.handlers
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
-# Configurando o logging
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Tamanho do buffer do arquivo de log
+_LOG_BUFFER = 64 * 1024
+
+class _BufferedFileHandler(logging.FileHandler):
+    """FileHandler que grava em blocos.
+    
+    O buffer do arquivo só é descarregado quando enche, em mensagens de erro,
+    em flush() explícito e no fechamento, em vez de uma escrita por mensagem.
+    """
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=_LOG_BUFFER,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def emit(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.stream.flush()
+        except Exception:
+            self.handleError(record)
+
+# Configurando o logging: o arquivo recebe as mensagens em lotes de 512,
+# antecipados por qualquer mensagem de erro
+_arquivo_log = _BufferedFileHandler("test_logs.log")
+_arquivo_log.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s'))
+_log_em_memoria = logging.handlers.MemoryHandler(512, flushLevel=logging.ERROR, target=_arquivo_log)
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s [%(levelname)s] %(message)s',
     handlers=[
-        logging.FileHandler("test_logs.log"),
+        _log_em_memoria,
         logging.StreamHandler(sys.stdout)
     ]
 )
 
+def _descarregar_log():
+    """Grava no arquivo de log as mensagens pendentes."""
+    _log_em_memoria.flush()
+    _arquivo_log.flush()
+
 logger = logging.getLogger("system_tester")
 
+# Durante os testes, as estatísticas são salvas a cada SAVE_EVERY_FAILURES falhas
+# ou SAVE_INTERVAL segundos, e sempre ao fim de cada fase
+SAVE_EVERY_FAILURES = 50
+SAVE_INTERVAL = 5.0
+
+# Log de eventos (uma falha por linha), gravado à medida que ocorrem e recriado a
+# cada execução; visualizar_estatisticas.py o combina com o último salvamento
+EVENTS_PATH = "test_events.jsonl"
+STATISTICS_PATH = "test_statistics.json"
+
+# Salvamentos intermediários (checkpoints) usam MessagePack, quando disponível, em
+# um arquivo ao lado do JSON; o JSON é gravado ao fim de cada fase e remove o checkpoint
+CHECKPOINT_SUFFIX = ".msgpack"
+
+# Tempo simulado de uma execução, em segundos; SIM_DELAY=0 (ou --fast) desliga as esperas.
+# A correção leva 10 vezes esse tempo e a análise via IA, 30 vezes
+SIM_DELAY = float(os.getenv("SIM_DELAY", "0.05"))
+
+# As esperas das execuções são acumuladas e cumpridas de uma só vez a cada
+# SLEEP_BATCH execuções, ou antes, quando uma execução falha
+SLEEP_BATCH = 1000
+
+# Quantidade de sorteios de falha e de tipo de erro gerados de uma vez pelos laços de teste
+BATCH = 4096
+_NP_RNG = np.random.default_rng() if np is not None else None
+
 # Define os módulos principais do sistema
 MODULOS = [
     "content_generation", 
@@ -29,8 +106,106 @@ MODULOS = [
     "resilience_service"
 ]
 
+# Probabilidade de falha por módulo (personalizável)
+_FAIL_PROB = {
+    "content_generation": 0.02,
+    "video_generation": 0.03,
+    "text_to_speech": 0.01,
+    "api_integration": 0.04,
+    "social_media_posting": 0.02,
+    "fallback_mechanisms": 0.01,
+    "resilience_service": 0.005,
+    None: 0.01  # Para varredura geral
+}
+
+# Tipos de erro por módulo
+_ERROR_TYPES = {
+    "content_generation": ("API timeout", "Invalid response format", "Content policy violation"),
+    "video_generation": ("FFmpeg error", "Video processing timeout", "Insufficient resources"),
+    "text_to_speech": ("Unsupported language", "Audio generation failed", "API rate limit"),
+    "api_integration": ("API connection refused", "Invalid credentials", "Rate limit exceeded"),
+    "social_media_posting": ("Authentication failed", "Post rejected", "Media format invalid"),
+    "fallback_mechanisms": ("No fallback available", "Fallback also failed", "Configuration error"),
+    "resilience_service": ("Service unavailable", "Health check failed"),
+    None: ("System error", "Unknown error", "Resource allocation failed", "Unexpected behavior")
+}
+_DEFAULT_ERRORS = ("Unknown error",)
+
+# Ação de correção registrada para cada tipo de erro, por módulo
+_CORRECTION_ACTIONS = {
+    "content_generation": {
+        "API timeout": "Aumentado timeout e implementado retry exponencial",
+        "Invalid response format": "Adicionada validação e normalização de resposta",
+        "Content policy violation": "Ajustado filtro de conteúdo com regras mais específicas"
+    },
+    "video_generation": {
+        "FFmpeg error": "Atualizado parâmetros FFmpeg para compatibilidade",
+        "Video processing timeout": "Otimizado processo de renderização com buffer",
+        "Insufficient resources": "Implementado gerenciamento dinâmico de recursos"
+    },
+    "text_to_speech": {
+        "Unsupported language": "Adicionado fallback para idioma não suportado",
+        "Audio generation failed": "Implementado mecanismo alternativo de síntese",
+        "API rate limit": "Adicionado controle de taxa com filas de prioridade"
+    },
+    "api_integration": {
+        "API connection refused": "Implementado circuito aberto com reconexão gradual",
+        "Invalid credentials": "Atualizado sistema de gerenciamento de tokens",
+        "Rate limit exceeded": "Adicionado throttling adaptativo baseado em feedback"
+    },
+    "social_media_posting": {
+        "Authentication failed": "Renovação automática de credenciais implementada",
+        "Post rejected": "Adicionado pré-verificador de conformidade",
+        "Media format invalid": "Implementado conversor automático de formato"
+    },
+    "fallback_mechanisms": {
+        "No fallback available": "Criado novo caminho de fallback para este cenário",
+        "Fallback also failed": "Adicionado sistema de fallback em camadas",
+        "Configuration error": "Correção de configuração e validação automática"
+    },
+    "resilience_service": {
+        "Service unavailable": "Implementado modo degradado autônomo",
+        "Health check failed": "Ajustado algoritmo de detecção de saúde do serviço"
+    }
+}
+
+def _novo_lote(modulo):
+    """Gera BATCH sorteios de falha e de tipo de erro para o módulo (com NumPy, quando disponível).
+    
+    Returns:
+        tuple: (sorteios uniformes, índices em _ERROR_TYPES), como listas.
+    """
+    quantidade = len(_ERROR_TYPES.get(modulo, _DEFAULT_ERRORS))
+    if _NP_RNG is not None:
+        return _NP_RNG.random(BATCH).tolist(), _NP_RNG.integers(0, quantidade, BATCH).tolist()
+    return (
+        [random.random() for _ in range(BATCH)],
+        [int(random.random() * quantidade) for _ in range(BATCH)]
+    )
+
+# Otimizações simuladas pela análise via IA
+_AI_OPTIMIZATIONS = (
+    "Ajuste de parâmetros baseado em padrões de uso detectados",
+    "Otimização de rotas de API baseada em análise de latência",
+    "Melhoria de prompts para geração de conteúdo mais preciso",
+    "Ajuste de pré-processamento de imagens para melhor reconhecimento",
+    "Refinamento dos algoritmos de fallback baseado em taxa de sucesso"
+)
+
+def _write_atomic(path, data):
+    """Grava os bytes em um arquivo temporário e o troca atomicamente pelo anterior.
+    
+    Uma interrupção no meio do salvamento nunca deixa o arquivo truncado.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
 class SystemTester:
-    def __init__(self):
+    def __init__(self, sim_delay=SIM_DELAY, statistics_path=STATISTICS_PATH, events_path=EVENTS_PATH):
         self.statistics = {
             "start_time": datetime.now().isoformat(),
             "modules_tested": {},
@@ -38,102 +213,257 @@ class SystemTester:
                 "attempts": 0,
                 "successes": 0,
                 "failures": 0,
-                "errors": {}
+                "errors": Counter()
             },
             "optimizations_applied": []
         }
+        self._dirty_since_save = 0
+        self._last_save_ts = time.monotonic()
+        self.sim_delay = sim_delay
+        self._pending_runs = 0
+        # statistics_path=None desliga os salvamentos (usado pelos processos de módulo)
+        self.statistics_path = statistics_path
+        self.events_path = events_path
+        self._event_log = None
+        self._events_written = 0
+        self._ts_cache = (0, "")
+        # Só o salvamento final é indentado; os intermediários são compactos
+        self._final_save = False
+    
+    def _now_iso(self):
+        """Data/hora atual em ISO, com resolução de segundos, formatada uma vez por segundo"""
+        segundo = int(time.time())
+        if segundo != self._ts_cache[0]:
+            self._ts_cache = (segundo, datetime.fromtimestamp(segundo).isoformat())
+        return self._ts_cache[1]
+    
+    def _sleep_pending(self):
+        """Cumpre de uma vez o tempo simulado das execuções acumuladas"""
+        if self._pending_runs:
+            time.sleep(self._pending_runs * self.sim_delay)
+            self._pending_runs = 0
+    
+    def _append_event(self, event):
+        """Acrescenta um evento ao log JSONL, sem regravar as estatísticas"""
+        if self._event_log is None:
+            self._event_log = open(self.events_path, "wb", buffering=_LOG_BUFFER)
+        # Identifica a execução, para que eventos de outra execução não sejam combinados
+        event["run"] = self.statistics["start_time"]
+        if orjson is not None:
+            self._event_log.write(orjson.dumps(event, option=orjson.OPT_APPEND_NEWLINE))
+        else:
+            self._event_log.write((json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._events_written += 1
+    
+    def close_event_log(self):
+        """Fecha o log de eventos, gravando as linhas pendentes"""
+        if self._event_log is not None:
+            self._event_log.close()
+            self._event_log = None
+    
+    def _prepare_save(self):
+        """Prepara um salvamento; retorna False se os salvamentos estão desligados"""
+        self._dirty_since_save = 0
+        self._last_save_ts = time.monotonic()
+        if self.statistics_path is None:
+            return False
+        
+        # Os eventos já contabilizados aqui precisam estar no disco antes do salvamento
+        if self._event_log is not None:
+            self._event_log.flush()
+        self.statistics["events_saved"] = self._events_written
+        return True
+    
+    def _checkpoint(self):
+        """Salva um checkpoint intermediário em MessagePack (ou JSON, sem msgpack)"""
+        if msgpack is None:
+            self.save_statistics()
+            return
+        if not self._prepare_save():
+            return
+        checkpoint_path = os.path.splitext(self.statistics_path)[0] + CHECKPOINT_SUFFIX
+        _write_atomic(checkpoint_path, msgpack.packb(self.statistics, use_bin_type=True))
+        logger.info("Checkpoint das estatísticas salvo.")
     
     def save_statistics(self):
         """Salva as estatísticas atuais em um arquivo JSON"""
-        with open("test_statistics.json", "w", encoding="utf-8") as f:
-            json.dump(self.statistics, f, ensure_ascii=False, indent=2)
+        if not self._prepare_save():
+            return
+        
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS
+            if self._final_save:
+                option |= orjson.OPT_INDENT_2
+            data = orjson.dumps(self.statistics, option=option)
+        else:
+            indent = 2 if self._final_save else None
+            data = json.dumps(self.statistics, ensure_ascii=False, indent=indent).encode("utf-8")
+        
+        _write_atomic(self.statistics_path, data)
+        # O JSON substitui qualquer checkpoint anterior
+        checkpoint_path = os.path.splitext(self.statistics_path)[0] + CHECKPOINT_SUFFIX
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
         logger.info("Estatísticas salvas com sucesso.")
     
+    def _maybe_save(self, force=False):
+        """Registra uma alteração e salva apenas se o lote ou o intervalo foi atingido.
+        Salvamentos forçados (fim de fase) gravam o JSON; os demais, um checkpoint."""
+        self._dirty_since_save += 1
+        if force:
+            self.save_statistics()
+        elif (self._dirty_since_save >= SAVE_EVERY_FAILURES
+                or time.monotonic() - self._last_save_ts > SAVE_INTERVAL):
+            self._checkpoint()
+    
     def testar_modulo(self, nome_modulo, tentativas=1000):
         """Executa um módulo individualmente e verifica se há erros."""
-        if nome_modulo not in self.statistics["modules_tested"]:
-            self.statistics["modules_tested"][nome_modulo] = {
-                "attempts": 0,
-                "successes": 0,
-                "failures": 0,
-                "errors": {}
-            }
+        mod_stats = self.statistics["modules_tested"].setdefault(nome_modulo, {
+            "attempts": 0,
+            "successes": 0,
+            "failures": 0,
+            "errors": Counter()
+        })
         
         execucoes_sucesso = 0
+        # Verificado uma vez: com INFO desligado, a mensagem por iteração nem é montada
+        log_iteracao = logger.isEnabledFor(logging.INFO)
+        # Referências resolvidas uma única vez para o laço
+        log_info = logger.info
+        exec_sys = self.executar_sistema
+        
+        sorteios, indices_erro = _novo_lote(nome_modulo)
+        indice = 0
         
         while execucoes_sucesso < tentativas:
-            self.statistics["modules_tested"][nome_modulo]["attempts"] += 1
-            logger.info(f"Executando módulo: {nome_modulo} ({execucoes_sucesso + 1}/{tentativas})")
+            mod_stats["attempts"] += 1
+            if log_iteracao:
+                log_info("Executando módulo: %s (%d/%d)", nome_modulo, execucoes_sucesso + 1, tentativas)
             
-            result, error_msg = self.executar_sistema(nome_modulo)
+            if indice == BATCH:
+                sorteios, indices_erro = _novo_lote(nome_modulo)
+                indice = 0
+            result, error_msg = exec_sys(nome_modulo, sorteios[indice], indices_erro[indice])
+            indice += 1
             
             if result:
                 execucoes_sucesso += 1
-                self.statistics["modules_tested"][nome_modulo]["successes"] += 1
+                mod_stats["successes"] += 1
+                continue
+            
+            execucoes_sucesso = self._handle_failure(nome_modulo, error_msg, mod_stats)
+        
+        self._sleep_pending()
+        logger.info("SUCESSO: Módulo %s passou no teste de %d execuções consecutivas!", nome_modulo, tentativas)
+        self._maybe_save(force=True)
+    
+    def _handle_failure(self, modulo, error_msg, stats):
+        """Registra e tenta corrigir uma falha de um módulo (ou do sistema geral, se None).
+        Retorna a nova contagem de execuções consecutivas, zerada pela falha."""
+        stats["failures"] += 1
+        
+        # Registrar o erro
+        stats["errors"][error_msg] += 1
+        
+        if modulo is None:
+            logger.error("Falha detectada no sistema geral. Erro: %s", error_msg)
+        else:
+            logger.error("Falha detectada no módulo: %s. Erro: %s", modulo, error_msg)
+        fixed = self.corrigir_erro(modulo, error_msg)
+        
+        if fixed:
+            if modulo is None:
+                logger.info("Sistema geral corrigido. Reiniciando teste...")
             else:
-                self.statistics["modules_tested"][nome_modulo]["failures"] += 1
-                
-                # Registrar o erro
-                if error_msg in self.statistics["modules_tested"][nome_modulo]["errors"]:
-                    self.statistics["modules_tested"][nome_modulo]["errors"][error_msg] += 1
-                else:
-                    self.statistics["modules_tested"][nome_modulo]["errors"][error_msg] = 1
-                
-                logger.error(f"Falha detectada no módulo: {nome_modulo}. Erro: {error_msg}")
-                fixed = self.corrigir_erro(nome_modulo, error_msg)
-                
-                if fixed:
-                    logger.info(f"Erro corrigido no módulo {nome_modulo}. Reiniciando teste...")
+                logger.info("Erro corrigido no módulo %s. Reiniciando teste...", modulo)
+        elif modulo is None:
+            logger.error("Não foi possível corrigir o erro no sistema geral.")
+        else:
+            logger.error("Não foi possível corrigir o erro no módulo %s.", modulo)
+        
+        self._append_event({
+            "timestamp": self._now_iso(),
+            "module": modulo,
+            "error": error_msg,
+            "fixed": fixed,
+            "attempts": stats["attempts"]
+        })
+        self._maybe_save()
+        return 0  # Reinicia a contagem se houver erro
+    
+    def testar_modulos(self, modulos, tentativas=1000):
+        """Testa os módulos em paralelo, um processo por módulo, e combina os resultados.
+        
+        Cada processo grava suas falhas em um log de eventos próprio, que é
+        transferido para o log desta execução ao final.
+        """
+        for modulo in modulos:
+            logger.info(f"Iniciando teste do módulo: {modulo}")
+        
+        # Mensagens pendentes seriam copiadas para os processos filhos e gravadas em dobro
+        _descarregar_log()
+        
+        workers = min(len(modulos), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            resultados = executor.map(
+                _test_module_worker,
+                modulos,
+                [tentativas] * len(modulos),
+                [self.sim_delay] * len(modulos)
+            )
+            
+            for modulo, (mod_stats, otimizacoes, events_path) in zip(modulos, resultados):
+                existente = self.statistics["modules_tested"].get(modulo)
+                if existente is None:
+                    self.statistics["modules_tested"][modulo] = mod_stats
                 else:
-                    logger.error(f"Não foi possível corrigir o erro no módulo {nome_modulo}.")
-                
-                execucoes_sucesso = 0  # Reinicia a contagem se houver erro
-                self.save_statistics()
+                    for campo in ("attempts", "successes", "failures"):
+                        existente[campo] += mod_stats[campo]
+                    existente["errors"].update(mod_stats["errors"])
+                self.statistics["optimizations_applied"].extend(otimizacoes)
+                self._transfer_events(events_path)
         
-        logger.info(f"SUCESSO: Módulo {nome_modulo} passou no teste de {tentativas} execuções consecutivas!")
-        self.save_statistics()
+        self._maybe_save(force=True)
     
-    def executar_sistema(self, modulo=None):
+    def _transfer_events(self, events_path):
+        """Acrescenta ao log desta execução os eventos gravados por um processo de módulo"""
+        if not os.path.exists(events_path):
+            return
+        loads = orjson.loads if orjson is not None else json.loads
+        with open(events_path, "rb") as f:
+            for linha in f:
+                self._append_event(loads(linha))
+        os.remove(events_path)
+    
+    def executar_sistema(self, modulo=None, sorteio=None, indice_erro=None):
         """Simula a execução do sistema ou de um módulo específico.
+        `sorteio` e `indice_erro` vêm de _novo_lote; sem eles, são sorteados aqui.
         Retorna (sucesso, mensagem_erro)"""
         try:
             # Aqui você implementaria a lógica real de execução do sistema ou módulo
             # Por enquanto, simulamos o comportamento com chance aleatória de erro
             
-            # Simula o tempo de execução
-            time.sleep(0.05)
-            
-            # Probabilidade de falha por módulo (personalizável)
-            falha_probabilidades = {
-                "content_generation": 0.02,
-                "video_generation": 0.03,
-                "text_to_speech": 0.01,
-                "api_integration": 0.04,
-                "social_media_posting": 0.02,
-                "fallback_mechanisms": 0.01,
-                "resilience_service": 0.005,
-                None: 0.01  # Para varredura geral
-            }
-            
-            # Tipos de erro por módulo
-            tipos_erro = {
-                "content_generation": ["API timeout", "Invalid response format", "Content policy violation"],
-                "video_generation": ["FFmpeg error", "Video processing timeout", "Insufficient resources"],
-                "text_to_speech": ["Unsupported language", "Audio generation failed", "API rate limit"],
-                "api_integration": ["API connection refused", "Invalid credentials", "Rate limit exceeded"],
-                "social_media_posting": ["Authentication failed", "Post rejected", "Media format invalid"],
-                "fallback_mechanisms": ["No fallback available", "Fallback also failed", "Configuration error"],
-                "resilience_service": ["Service unavailable", "Health check failed"],
-                None: ["System error", "Unknown error", "Resource allocation failed", "Unexpected behavior"]
-            }
+            # Simula o tempo de execução, acumulado para uma única espera por lote
+            if self.sim_delay:
+                self._pending_runs += 1
+                if self._pending_runs >= SLEEP_BATCH:
+                    self._sleep_pending()
             
             # Chance de erro baseada no módulo
-            erro_chance = falha_probabilidades.get(modulo, 0.01)
+            erro_chance = _FAIL_PROB.get(modulo, 0.01)
+            
+            if sorteio is None:
+                sorteio = random.random()
             
-            if random.random() < erro_chance:
+            if sorteio < erro_chance:
+                self._sleep_pending()
+                
                 # Seleciona um tipo de erro aleatório para este módulo
-                possiveis_erros = tipos_erro.get(modulo, ["Unknown error"])
-                erro_selecionado = random.choice(possiveis_erros)
+                possiveis_erros = _ERROR_TYPES.get(modulo, _DEFAULT_ERRORS)
+                if indice_erro is None:
+                    erro_selecionado = random.choice(possiveis_erros)
+                else:
+                    erro_selecionado = possiveis_erros[indice_erro]
                 
                 raise ValueError(f"{erro_selecionado} em {modulo if modulo else 'Sistema Geral'}")
             
@@ -150,7 +480,7 @@ class SystemTester:
         # Aqui você implementaria a lógica real de correção baseada no módulo e tipo de erro
         # Por enquanto, simulamos com uma chance de sucesso na correção
         
-        time.sleep(0.5)  # Simula o tempo de correção
+        time.sleep(self.sim_delay * 10)  # Simula o tempo de correção
         
         # 95% de chance de sucesso na correção
         correcao_sucesso = random.random() < 0.95
@@ -158,7 +488,7 @@ class SystemTester:
         if correcao_sucesso:
             # Registrar otimização aplicada
             otimizacao = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": self._now_iso(),
                 "module": modulo,
                 "error": erro,
                 "action": f"Correção aplicada em {modulo}: {self._gerar_acao_correcao(modulo, erro)}"
@@ -173,76 +503,27 @@ class SystemTester:
     
     def _gerar_acao_correcao(self, modulo, erro):
         """Gera uma descrição da ação de correção baseada no módulo e erro"""
-        acoes = {
-            "content_generation": {
-                "API timeout": "Aumentado timeout e implementado retry exponencial",
-                "Invalid response format": "Adicionada validação e normalização de resposta",
-                "Content policy violation": "Ajustado filtro de conteúdo com regras mais específicas"
-            },
-            "video_generation": {
-                "FFmpeg error": "Atualizado parâmetros FFmpeg para compatibilidade",
-                "Video processing timeout": "Otimizado processo de renderização com buffer",
-                "Insufficient resources": "Implementado gerenciamento dinâmico de recursos"
-            },
-            "text_to_speech": {
-                "Unsupported language": "Adicionado fallback para idioma não suportado",
-                "Audio generation failed": "Implementado mecanismo alternativo de síntese",
-                "API rate limit": "Adicionado controle de taxa com filas de prioridade"
-            },
-            "api_integration": {
-                "API connection refused": "Implementado circuito aberto com reconexão gradual",
-                "Invalid credentials": "Atualizado sistema de gerenciamento de tokens",
-                "Rate limit exceeded": "Adicionado throttling adaptativo baseado em feedback"
-            },
-            "social_media_posting": {
-                "Authentication failed": "Renovação automática de credenciais implementada",
-                "Post rejected": "Adicionado pré-verificador de conformidade",
-                "Media format invalid": "Implementado conversor automático de formato"
-            },
-            "fallback_mechanisms": {
-                "No fallback available": "Criado novo caminho de fallback para este cenário",
-                "Fallback also failed": "Adicionado sistema de fallback em camadas",
-                "Configuration error": "Correção de configuração e validação automática"
-            },
-            "resilience_service": {
-                "Service unavailable": "Implementado modo degradado autônomo",
-                "Health check failed": "Ajustado algoritmo de detecção de saúde do serviço"
-            }
-        }
-        
-        # Extrair o tipo de erro do texto completo
-        for erro_tipo in acoes.get(modulo, {}).keys():
-            if erro_tipo in erro:
-                return acoes[modulo][erro_tipo]
-        
-        return "Aplicada correção genérica baseada em análise de padrões"
+        # Extrair o tipo de erro do texto completo ("<tipo> em <módulo>")
+        erro_tipo = erro.rsplit(" em ", 1)[0]
+        return _CORRECTION_ACTIONS.get(modulo, {}).get(
+            erro_tipo, "Aplicada correção genérica baseada em análise de padrões"
+        )
     
     def analisar_apis_ia(self):
         """Verifica e aplica otimizações baseadas em APIs e Inteligências Artificiais."""
         logger.info("Verificando APIs e IAs para otimizações...")
         
         # Simula o tempo de análise
-        time.sleep(1.5)
-        
-        # Simula otimizações baseadas em IA
-        otimizacoes = [
-            "Ajuste de parâmetros baseado em padrões de uso detectados",
-            "Otimização de rotas de API baseada em análise de latência",
-            "Melhoria de prompts para geração de conteúdo mais preciso",
-            "Ajuste de pré-processamento de imagens para melhor reconhecimento",
-            "Refinamento dos algoritmos de fallback baseado em taxa de sucesso"
-        ]
+        time.sleep(self.sim_delay * 30)
         
-        # Aplica algumas otimizações aleatórias
-        aplicadas = random.sample(otimizacoes, k=min(3, len(otimizacoes)))
-        
-        for otimizacao in aplicadas:
-            self.statistics["optimizations_applied"].append({
-                "timestamp": datetime.now().isoformat(),
-                "module": "IA_analysis",
-                "action": otimizacao
-            })
-            logger.info(f"Otimização aplicada: {otimizacao}")
+        # Aplica algumas otimizações aleatórias, todas com o mesmo timestamp
+        aplicadas = random.sample(_AI_OPTIMIZATIONS, k=min(3, len(_AI_OPTIMIZATIONS)))
+        ts = self._now_iso()
+        self.statistics["optimizations_applied"].extend(
+            {"timestamp": ts, "module": "IA_analysis", "action": otimizacao}
+            for otimizacao in aplicadas
+        )
+        logger.info("Otimizações aplicadas: %s", "; ".join(aplicadas))
         
         logger.info("Melhorias aplicadas com sucesso!")
         self.save_statistics()
@@ -253,39 +534,36 @@ class SystemTester:
         Nota: Reduzimos de 100.000 para 100 para fins de demonstração
         Em um ambiente real, você ajustaria conforme necessário.
         """
+        gen_stats = self.statistics["general_tests"]
         execucoes_sucesso = 0
+        log_iteracao = logger.isEnabledFor(logging.INFO)
+        log_info = logger.info
+        exec_sys = self.executar_sistema
+        
+        sorteios, indices_erro = _novo_lote(None)
+        indice = 0
         
         while execucoes_sucesso < tentativas:
-            self.statistics["general_tests"]["attempts"] += 1
-            logger.info(f"Teste Geral - Execução {execucoes_sucesso + 1}/{tentativas}")
+            gen_stats["attempts"] += 1
+            if log_iteracao:
+                log_info("Teste Geral - Execução %d/%d", execucoes_sucesso + 1, tentativas)
             
-            result, error_msg = self.executar_sistema()
+            if indice == BATCH:
+                sorteios, indices_erro = _novo_lote(None)
+                indice = 0
+            result, error_msg = exec_sys(None, sorteios[indice], indices_erro[indice])
+            indice += 1
             
             if result:
                 execucoes_sucesso += 1
-                self.statistics["general_tests"]["successes"] += 1
-            else:
-                self.statistics["general_tests"]["failures"] += 1
-                
-                # Registrar o erro
-                if error_msg in self.statistics["general_tests"]["errors"]:
-                    self.statistics["general_tests"]["errors"][error_msg] += 1
-                else:
-                    self.statistics["general_tests"]["errors"][error_msg] = 1
-                
-                logger.error(f"Falha detectada no sistema geral. Erro: {error_msg}")
-                fixed = self.corrigir_erro(None, error_msg)
-                
-                if fixed:
-                    logger.info("Sistema geral corrigido. Reiniciando teste...")
-                else:
-                    logger.error("Não foi possível corrigir o erro no sistema geral.")
-                
-                execucoes_sucesso = 0  # Reinicia a contagem se houver erro
-                self.save_statistics()
+                gen_stats["successes"] += 1
+                continue
+            
+            execucoes_sucesso = self._handle_failure(None, error_msg, gen_stats)
         
-        logger.info(f"SUCESSO: O sistema passou no teste de {tentativas} execuções consecutivas!")
-        self.save_statistics()
+        self._sleep_pending()
+        logger.info("SUCESSO: O sistema passou no teste de %d execuções consecutivas!", tentativas)
+        self._maybe_save(force=True)
     
     def executar_teste_completo(self, completo=False):
         """Executa todas as fases de teste e otimização.
@@ -308,10 +586,8 @@ class SystemTester:
         logger.info(f"Modo: {'Completo' if completo else 'Demonstração'}")
         
         try:
-            # Testa cada módulo individualmente
-            for modulo in MODULOS:
-                logger.info(f"Iniciando teste do módulo: {modulo}")
-                self.testar_modulo(modulo, tentativas_modulo)
+            # Testa cada módulo individualmente, em paralelo
+            self.testar_modulos(MODULOS, tentativas_modulo)
             
             # Executa a varredura geral
             logger.info("Iniciando varredura geral do sistema")
@@ -332,6 +608,7 @@ class SystemTester:
             
             self.statistics["end_time"] = fim.isoformat()
             self.statistics["duration_seconds"] = duracao.total_seconds()
+            self._final_save = True
             self.save_statistics()
             
             return True
@@ -339,14 +616,47 @@ class SystemTester:
         except Exception as e:
             logger.error(f"Erro fatal durante execução dos testes: {e}")
             self.statistics["fatal_error"] = str(e)
+            self._final_save = True
             self.save_statistics()
             return False
+        
+        finally:
+            self.close_event_log()
+            _descarregar_log()
+
+def _init_worker():
+    """Renova os geradores aleatórios herdados do processo pai"""
+    global _NP_RNG
+    random.seed()
+    if np is not None:
+        _NP_RNG = np.random.default_rng()
+
+def _test_module_worker(nome_modulo, tentativas, sim_delay):
+    """Testa um módulo em um processo separado, sem salvar estatísticas.
+    
+    Returns:
+        tuple: (estatísticas do módulo, otimizações aplicadas, log de eventos do processo)
+    """
+    events_path = f"test_events.{nome_modulo}.jsonl"
+    tester = SystemTester(sim_delay=sim_delay, statistics_path=None, events_path=events_path)
+    try:
+        tester.testar_modulo(nome_modulo, tentativas)
+    finally:
+        tester.close_event_log()
+        # Os processos do pool encerram sem passar por logging.shutdown
+        _descarregar_log()
+    return (
+        tester.statistics["modules_tested"][nome_modulo],
+        tester.statistics["optimizations_applied"],
+        events_path
+    )
 
 # Função principal
 def main():
     logger.info("=== INICIANDO SISTEMA DE TESTES AUTOMATIZADOS ===")
     
-    tester = SystemTester()
+    # --fast desliga o tempo simulado de execução, correção e análise
+    tester = SystemTester(sim_delay=0.0 if "--fast" in sys.argv else SIM_DELAY)
     
     # Para fins de demonstração, usamos a versão reduzida
     # Em produção, você mudaria para True para executar o teste completo
@@ -7,12 +7,20 @@ o funcionamento real dos módulos do aplicativo
 
 import os
 import sys
+import asyncio
 import logging
 import json
-import time
 import requests
+from itertools import groupby
+from operator import itemgetter
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Adiciona o diretório pai ao caminho para importar outros módulos
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -31,6 +39,12 @@ logger = logging.getLogger("integration_tester")
 # URL base da API (assumindo que o servidor está rodando localmente)
 API_BASE_URL = "http://localhost:3000/api"
 
+# Arquivo de resultados; o coordenador aponta direto para o diretório da execução
+RESULTS_PATH = os.getenv("RESULT_OUTPUT_PATH", "integration_test_results.json")
+
+# Número máximo de requisições simultâneas para não sobrecarregar o servidor
+MAX_CONCURRENT_REQUESTS = 4
+
 # Define os módulos principais do sistema que serão testados
 MODULES = {
     "content_generation": {
@@ -94,6 +108,29 @@ MODULES = {
     }
 }
 
+def encode_payload(data):
+    """Serializa o corpo JSON de uma requisição, sem o campo 'method'"""
+    payload = {k: v for k, v in data.items() if k != "method"}
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+def flatten_tests(modules):
+    """Achata MODULES em registros (módulo, endpoint, método, corpo JSON em bytes)"""
+    flat = []
+    for module_name, module_info in modules.items():
+        for endpoint in module_info["endpoints"]:
+            data = module_info["test_data"].get(endpoint, {})
+            method = data.get("method", "POST").upper()
+            payload = None if method == "GET" else encode_payload(data)
+            flat.append((module_name, endpoint, method, payload))
+    return tuple(flat)
+
+# Testes compilados uma única vez no carregamento do módulo, agrupados por módulo
+FLAT_TESTS = flatten_tests(MODULES)
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 class IntegrationTester:
     def __init__(self):
         self.results = {
@@ -102,27 +139,63 @@ class IntegrationTester:
             "success_rate": {},
             "failed_tests": []
         }
+        
+        # Sessão compartilhada para reutilizar conexões (keep-alive) entre tentativas
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # Definidos por execução em run_all_tests_async (ou em test_module, isoladamente)
+        self._semaphore = None
+        self._failures_log = None
+    
+    def close(self):
+        """Fecha a sessão HTTP e suas conexões"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def save_results(self):
         """Salva os resultados em um arquivo JSON"""
-        with open("integration_test_results.json", "w", encoding="utf-8") as f:
-            json.dump(self.results, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            with open(RESULTS_PATH, "wb") as f:
+                f.write(orjson.dumps(self.results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(RESULTS_PATH, "w", encoding="utf-8") as f:
+                json.dump(self.results, f, ensure_ascii=False, indent=2)
         logger.info("Resultados salvos com sucesso.")
     
+    def log_failure(self, failure):
+        """Acrescenta uma falha ao arquivo JSONL, sem regravar todos os resultados"""
+        if self._failures_log is None:
+            return
+        if orjson is not None:
+            self._failures_log.write(orjson.dumps(failure, option=orjson.OPT_APPEND_NEWLINE))
+        else:
+            self._failures_log.write((json.dumps(failure, ensure_ascii=False) + "\n").encode("utf-8"))
+    
     def test_endpoint(self, module, endpoint, data):
         """Testa um endpoint específico da API"""
+        method = data.get("method", "POST").upper()
+        payload = None if method == "GET" else encode_payload(data)
+        return self.send_request(endpoint, method, payload)
+    
+    def send_request(self, endpoint, method, payload):
+        """Envia uma requisição já compilada e avalia a resposta"""
         url = f"{API_BASE_URL}{endpoint}"
-        method = data.get("method", "POST")
         
         logger.info(f"Testando {method} {url}")
         
         try:
-            if method.upper() == "GET":
-                response = requests.get(url, timeout=30)
+            if method == "GET":
+                response = self.session.get(url, timeout=30)
             else:
-                # Remove o campo 'method' antes de enviar
-                payload = {k: v for k, v in data.items() if k != "method"}
-                response = requests.post(url, json=payload, timeout=30)
+                response = self.session.post(url, data=payload, headers=JSON_HEADERS, timeout=30)
             
             if response.status_code >= 200 and response.status_code < 300:
                 logger.info(f"Teste bem-sucedido: {response.status_code}")
@@ -139,8 +212,37 @@ class IntegrationTester:
             logger.error(f"Erro inesperado: {str(e)}")
             return False, str(e)
     
+    async def _send_request_limited(self, endpoint, method, payload, attempt, attempts):
+        """Executa uma tentativa respeitando o limite de requisições simultâneas"""
+        async with self._semaphore:
+            logger.info(f"Tentativa {attempt}/{attempts} para {endpoint}")
+            return await asyncio.to_thread(self.send_request, endpoint, method, payload)
+    
+    async def _test_endpoint_attempts(self, module_name, endpoint, method, payload, attempts):
+        """Dispara todas as tentativas de um endpoint de forma concorrente"""
+        logger.info(f"Iniciando teste do endpoint {endpoint} no módulo {module_name}")
+        tasks = [
+            asyncio.create_task(
+                self._send_request_limited(endpoint, method, payload, attempt, attempts)
+            )
+            for attempt in range(1, attempts + 1)
+        ]
+        return await asyncio.gather(*tasks)
+    
     def test_module(self, module_name, module_info, attempts=10):
-        """Testa todos os endpoints de um módulo"""
+        """Testa todos os endpoints de um módulo isoladamente"""
+        tests = flatten_tests({module_name: module_info})
+        return asyncio.run(self._test_module_standalone(module_name, tests, attempts))
+    
+    async def _test_module_standalone(self, module_name, tests, attempts):
+        # O semáforo pertence ao loop criado por asyncio.run
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        await self._test_module_async(module_name, tests, attempts)
+    
+    async def _test_module_async(self, module_name, tests, attempts=10):
+        """Testa todos os endpoints de um módulo a partir de seus registros em FLAT_TESTS"""
+        logger.info(f"Testando módulo: {module_name}")
+        
         if module_name not in self.results["modules_tested"]:
             self.results["modules_tested"][module_name] = {
                 "total_tests": 0,
@@ -148,58 +250,69 @@ class IntegrationTester:
                 "endpoints": {}
             }
         
-        for endpoint in module_info["endpoints"]:
-            test_data = module_info["test_data"].get(endpoint, {})
-            
-            logger.info(f"Iniciando teste do endpoint {endpoint} no módulo {module_name}")
-            
-            # Inicializa estatísticas para este endpoint
-            if endpoint not in self.results["modules_tested"][module_name]["endpoints"]:
-                self.results["modules_tested"][module_name]["endpoints"][endpoint] = {
-                    "attempts": 0,
-                    "successes": 0,
-                    "failures": 0
-                }
-            
+        outcomes_by_endpoint = await asyncio.gather(*(
+            self._test_endpoint_attempts(module_name, endpoint, method, payload, attempts)
+            for _, endpoint, method, payload in tests
+        ))
+        
+        module_stats = self.results["modules_tested"][module_name]
+        local_failures = []
+        
+        for (_, endpoint, _, _), outcomes in zip(tests, outcomes_by_endpoint):
             successes = 0
             
-            for attempt in range(1, attempts + 1):
-                self.results["modules_tested"][module_name]["total_tests"] += 1
-                self.results["modules_tested"][module_name]["endpoints"][endpoint]["attempts"] += 1
-                
-                logger.info(f"Tentativa {attempt}/{attempts} para {endpoint}")
-                
-                success, error = self.test_endpoint(module_name, endpoint, test_data)
-                
+            for success, error in outcomes:
                 if success:
                     successes += 1
-                    self.results["modules_tested"][module_name]["successful_tests"] += 1
-                    self.results["modules_tested"][module_name]["endpoints"][endpoint]["successes"] += 1
                 else:
-                    self.results["modules_tested"][module_name]["endpoints"][endpoint]["failures"] += 1
-                    self.results["failed_tests"].append({
+                    local_failures.append({
                         "module": module_name,
                         "endpoint": endpoint,
                         "timestamp": datetime.now().isoformat(),
                         "error": error
                     })
-                
-                # Curto intervalo entre requisições para não sobrecarregar
-                time.sleep(0.5)
+            
+            # Atualiza as estatísticas do endpoint uma única vez
+            endpoint_stats = module_stats["endpoints"].setdefault(endpoint, {
+                "attempts": 0,
+                "successes": 0,
+                "failures": 0
+            })
+            endpoint_stats["attempts"] += len(outcomes)
+            endpoint_stats["successes"] += successes
+            endpoint_stats["failures"] += len(outcomes) - successes
+            module_stats["total_tests"] += len(outcomes)
+            module_stats["successful_tests"] += successes
             
             # Calcula a taxa de sucesso para este endpoint
             success_rate = (successes / attempts) * 100
             logger.info(f"Taxa de sucesso para {endpoint}: {success_rate:.2f}%")
-            
-            self.save_results()
+        
+        self.results["failed_tests"].extend(local_failures)
+        for failure in local_failures:
+            self.log_failure(failure)
+        
+        self.save_results()
     
-    def run_all_tests(self, test_attempts=10):
-        """Executa testes em todos os módulos"""
+    async def run_all_tests_async(self, test_attempts=10, concurrency=MAX_CONCURRENT_REQUESTS):
+        """Executa testes em todos os módulos, com tentativas concorrentes"""
         logger.info(f"Iniciando testes de integração com {test_attempts} tentativas por endpoint")
         
-        for module_name, module_info in MODULES.items():
-            logger.info(f"Testando módulo: {module_name}")
-            self.test_module(module_name, module_info, test_attempts)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        
+        # Recriado a cada execução, como o arquivo de resultados
+        with open("failed_tests.jsonl", "wb") as failures_log:
+            self._failures_log = failures_log
+            try:
+                # Os módulos são independentes: as estatísticas de cada um são atualizadas
+                # sem pontos de await intermediários, então não há disputa entre as tarefas
+                await asyncio.gather(*(
+                    self._test_module_async(module_name, tuple(tests), test_attempts)
+                    for module_name, tests in groupby(FLAT_TESTS, key=itemgetter(0))
+                ))
+            finally:
+                # Não deixa o atributo apontando para um arquivo fechado
+                self._failures_log = None
         
         # Calcula taxas de sucesso gerais
         for module_name, module_data in self.results["modules_tested"].items():
@@ -225,19 +338,22 @@ class IntegrationTester:
             logger.info(f"Módulo {module}: {rate}")
         
         return self.results
+    
+    def run_all_tests(self, test_attempts=10, concurrency=MAX_CONCURRENT_REQUESTS):
+        """Executa testes em todos os módulos"""
+        return asyncio.run(self.run_all_tests_async(test_attempts, concurrency))
 
 def main():
     """Função principal para executar os testes de integração"""
     logger.info("=== INICIANDO TESTES DE INTEGRAÇÃO ===")
     
-    tester = IntegrationTester()
-    
-    # Usar um número menor de tentativas para demonstração
-    # Em produção, você pode aumentar este número
-    results = tester.run_all_tests(test_attempts=5)
+    with IntegrationTester() as tester:
+        # Usar um número menor de tentativas para demonstração
+        # Em produção, você pode aumentar este número
+        results = asyncio.run(tester.run_all_tests_async(test_attempts=5))
     
     logger.info("=== TESTES DE INTEGRAÇÃO CONCLUÍDOS ===")
-    logger.info(f"Resultados salvos em 'integration_test_results.json'")
+    logger.info(f"Resultados salvos em '{RESULTS_PATH}'")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
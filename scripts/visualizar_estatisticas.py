@@ -6,25 +6,118 @@ import os
 import sys
 import datetime
 import argparse
-from tabulate import tabulate
+from functools import lru_cache
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Ambos aceitam bytes: os arquivos são lidos em modo binário e decodificados pelo parser
+_loads = orjson.loads if orjson is not None else json.loads
+
+@lru_cache(maxsize=2048)
 def formatar_hora(tempo_str):
     """Formata uma string de data/hora ISO para exibição mais legível."""
     try:
         dt = datetime.datetime.fromisoformat(tempo_str)
         return dt.strftime("%d/%m/%Y %H:%M:%S")
-    except:
+    except (ValueError, TypeError):
         return tempo_str
 
 def carregar_estatisticas(arquivo):
     """Carrega um arquivo JSON de estatísticas."""
     try:
-        with open(arquivo, 'r') as f:
-            return json.load(f)
+        with open(arquivo, 'rb') as f:
+            return _loads(f.read())
     except Exception as e:
         print(f"Erro ao carregar {arquivo}: {e}")
         return None
 
+def carregar_estatisticas_testes(arquivo, checkpoint):
+    """Carrega as estatísticas dos testes, preferindo o checkpoint MessagePack
+    quando ele é mais recente que o JSON (execução interrompida ou em andamento)."""
+    if (msgpack is not None and os.path.exists(checkpoint)
+            and (not os.path.exists(arquivo) or os.path.getmtime(checkpoint) > os.path.getmtime(arquivo))):
+        try:
+            with open(checkpoint, 'rb') as f:
+                return msgpack.unpackb(f.read(), raw=False)
+        except Exception as e:
+            print(f"Erro ao carregar {checkpoint}: {e}")
+    return carregar_estatisticas(arquivo)
+
+def carregar_eventos(arquivo):
+    """Carrega o log de eventos JSONL dos testes, se existir.
+
+    Para na primeira linha inválida (por exemplo, a última linha cortada por
+    uma interrupção), mantendo os eventos lidos até ela.
+    """
+    if not os.path.exists(arquivo):
+        return []
+    eventos = []
+    try:
+        with open(arquivo, 'rb') as f:
+            for numero, linha in enumerate(f, 1):
+                if not linha.strip():
+                    continue
+                try:
+                    eventos.append(_loads(linha))
+                except ValueError:
+                    print(f"Linha {numero} inválida em {arquivo}; usando os {len(eventos)} eventos anteriores.")
+                    break
+    except OSError as e:
+        print(f"Erro ao carregar {arquivo}: {e}")
+    return eventos
+
+def mesclar_eventos(estatisticas, eventos):
+    """Aplica às estatísticas as falhas registradas após o último salvamento.
+    
+    Os primeiros `events_saved` eventos já estão contabilizados no arquivo de
+    estatísticas; eventos de outra execução são ignorados.
+    """
+    if not estatisticas:
+        return estatisticas
+    
+    execucao = estatisticas.get('start_time')
+    for evento in eventos[estatisticas.get('events_saved', 0):]:
+        if evento.get('run') != execucao:
+            continue
+        
+        modulo = evento.get('module')
+        if modulo is None:
+            stats = estatisticas.setdefault('general_tests', {})
+        else:
+            stats = estatisticas.setdefault('modules_tested', {}).setdefault(modulo, {})
+        
+        stats['failures'] = stats.get('failures', 0) + 1
+        stats['attempts'] = max(stats.get('attempts', 0), evento.get('attempts', 0))
+        stats['successes'] = stats['attempts'] - stats['failures']
+        erros = stats.setdefault('errors', {})
+        erros[evento.get('error')] = erros.get(evento.get('error'), 0) + 1
+    
+    return estatisticas
+
+def _truncate_join(keys, limit=50):
+    """Junta as chaves com ", " parando assim que o texto passar de `limit` caracteres."""
+    partes = []
+    tamanho = 0
+    for chave in keys:
+        if tamanho + len(chave) > limit:
+            partes.append("...")
+            break
+        partes.append(chave)
+        tamanho += len(chave) + 2
+    return ", ".join(partes)
+
+# Layout fixo da tabela de módulos; tabulate só é usado com --pretty
+_CABECALHO_TESTES = ("Módulo", "Tentativas", "Sucessos", "Falhas", "Taxa Sucesso", "Erros")
+_FORMATO_TESTES = "{:<25}{:>10}{:>10}{:>10}{:>14}  {}"
+
 def exibir_varredura(estatisticas):
     """Exibe estatísticas da varredura do sistema."""
     if not estatisticas:
@@ -64,7 +157,7 @@ def exibir_varredura(estatisticas):
     else:
         print("\nNenhum erro detectado!")
 
-def exibir_testes(estatisticas):
+def exibir_testes(estatisticas, pretty=False):
     """Exibe estatísticas dos testes automatizados."""
     if not estatisticas:
         print("Nenhuma estatística de teste disponível.")
@@ -87,9 +180,7 @@ def exibir_testes(estatisticas):
             else:
                 taxa_sucesso = 0
                 
-            erros = ", ".join(stats.get('errors', {}).keys())
-            if not erros:
-                erros = "Nenhum"
+            erros = _truncate_join(stats.get('errors', {})) or "Nenhum"
                 
             tabela.append([
                 modulo,
@@ -97,11 +188,16 @@ def exibir_testes(estatisticas):
                 sucesso,
                 falhas,
                 f"{taxa_sucesso:.2f}%",
-                erros[:50] + ("..." if len(erros) > 50 else "")
+                erros
             ])
         
         print("\nDesempenho por módulo:")
-        print(tabulate(tabela, headers=["Módulo", "Tentativas", "Sucessos", "Falhas", "Taxa Sucesso", "Erros"]))
+        if pretty:
+            from tabulate import tabulate
+            print(tabulate(tabela, headers=_CABECALHO_TESTES))
+        else:
+            print("\n".join(_FORMATO_TESTES.format(*linha)
+                            for linha in [_CABECALHO_TESTES, *tabela]))
     else:
         print("\nNenhum módulo testado.")
     
@@ -127,6 +223,7 @@ def main():
     parser.add_argument("--varredura", action="store_true", help="Exibir estatísticas de varredura")
     parser.add_argument("--testes", action="store_true", help="Exibir estatísticas de testes automatizados")
     parser.add_argument("--todos", action="store_true", help="Exibir todas as estatísticas")
+    parser.add_argument("--pretty", action="store_true", help="Formatar a tabela de módulos com tabulate")
     
     args = parser.parse_args()
     
@@ -142,7 +239,8 @@ def main():
         varredura_stats = carregar_estatisticas('varredura_estatisticas.json')
         
     if args.testes or args.todos:
-        testes_stats = carregar_estatisticas('test_statistics.json')
+        testes_stats = carregar_estatisticas_testes('test_statistics.json', 'test_statistics.msgpack')
+        testes_stats = mesclar_eventos(testes_stats, carregar_eventos('test_events.jsonl'))
     
     # Exibe as estatísticas
     print("=" * 60)
@@ -153,7 +251,7 @@ def main():
         exibir_varredura(varredura_stats)
         
     if args.testes or args.todos:
-        exibir_testes(testes_stats)
+        exibir_testes(testes_stats, pretty=args.pretty)
     
     print("\n" + "=" * 60)
 
@@ -1,48 +1,189 @@
-
+import sys
 import time
 import random
+import logging
+import logging.handlers
+import argparse
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+log = logging.getLogger(__name__)
+
+# Chance de erro em cada execução do sistema
+PROB_ERRO = 0.1
+MENSAGEM_ERRO = "Erro detectado na execução do sistema."
 
-def rodar_sistema():
+# Quantidade de sorteios gerados de uma vez pelo laço principal
+BATCH = 4096
+
+# Gerador próprio do módulo, sem passar pela instância global de random
+_RNG = random.Random()
+_random = _RNG.random
+_NP_RNG = np.random.default_rng(_RNG.getrandbits(64)) if np is not None else None
+
+# Limites do backoff exponencial com "full jitter" aplicado após uma falha
+BACKOFF_BASE = 0.01
+BACKOFF_CAP = 0.05
+
+def rodar_sistema(tentativa=0):
     try:
-        print("Executando o sistema...")
+        log.debug("Executando o sistema...")
         
         # Simula erro com 10% de chance
-        if random.random() < 0.1:
-            raise ValueError("Erro detectado na execução do sistema.")
+        if _random() < PROB_ERRO:
+            raise ValueError(MENSAGEM_ERRO)
             
         return True  # Execução bem-sucedida
         
     except Exception as e:
-        print(f"Erro detectado: {e}")
-        corrigir_erro(e)  # Chama a função para corrigir o erro
+        log.debug("Erro detectado: %s", e)
+        corrigir_erro(e, tentativa)  # Chama a função para corrigir o erro
         return False
 
-def corrigir_erro(erro):
-    print(f"Tentando corrigir o erro: {erro}")
-    time.sleep(1)  # Simula tempo de correção
-    print("Correção aplicada")
+def corrigir_erro(erro, tentativa=0):
+    log.debug("Tentando corrigir o erro: %s", erro)
+    # Espera com backoff exponencial e full jitter, limitada a BACKOFF_CAP
+    time.sleep(min(BACKOFF_CAP, BACKOFF_BASE * 2 ** tentativa) * _random())
+    log.debug("Correção aplicada")
+
+def _novo_lote():
+    """Gera BATCH sorteios uniformes de uma vez (com NumPy, quando disponível)."""
+    if _NP_RNG is not None:
+        return _NP_RNG.random(BATCH).tolist()
+    return [_random() for _ in range(BATCH)]
 
-def executar_com_resiliencia():
-    max_tentativas = 100
+def executar_com_resiliencia(sleep_between=0.0, prob_erro=PROB_ERRO, meta=1000,
+                             max_tentativas=100, simular_correcao=True):
     execucoes_sucesso = 0
     tentativas_consecutivas = 0
     
-    while execucoes_sucesso < 1000 and tentativas_consecutivas < max_tentativas:
-        if rodar_sistema():
+    # Os sorteios de erro são gerados em lote, no lugar de uma chamada a
+    # rodar_sistema por iteração
+    sorteios = _novo_lote()
+    indice = 0
+    
+    while execucoes_sucesso < meta and tentativas_consecutivas < max_tentativas:
+        if indice == BATCH:
+            sorteios = _novo_lote()
+            indice = 0
+        falhou = sorteios[indice] < prob_erro
+        indice += 1
+        
+        log.debug("Executando o sistema...")
+        
+        if not falhou:
             execucoes_sucesso += 1
             tentativas_consecutivas = 0
-            print(f"Execução bem-sucedida: {execucoes_sucesso}/1000")
+            log.debug("Execução bem-sucedida: %d/%d", execucoes_sucesso, meta)
         else:
+            # Um único sorteio decide a iteração; a exceção não precisa ser criada
+            log.debug("Erro detectado: %s", MENSAGEM_ERRO)
+            if simular_correcao:
+                corrigir_erro(MENSAGEM_ERRO, tentativas_consecutivas)
+            
             tentativas_consecutivas += 1
             execucoes_sucesso = 0
-            print(f"Reiniciando contagem. Tentativas consecutivas: {tentativas_consecutivas}")
+            log.debug("Reiniciando contagem. Tentativas consecutivas: %d", tentativas_consecutivas)
         
-        time.sleep(0.1)  # Pequeno delay entre execuções
+        if sleep_between:
+            time.sleep(sleep_between)  # Delay opcional entre execuções
     
-    if execucoes_sucesso >= 1000:
-        print("Sistema executado com sucesso 1000 vezes!")
-    else:
-        print("Muitas falhas consecutivas. Sistema interrompido.")
+    if execucoes_sucesso >= meta:
+        log.info("Sistema executado com sucesso %d vezes!", meta)
+        return True
+    
+    log.warning("Muitas falhas consecutivas. Sistema interrompido.")
+    return False
+
+def executar_com_resiliencia_rapida(lote=64, prob_erro=PROB_ERRO, meta=1000, max_tentativas=100):
+    """Versão especializada de executar_com_resiliencia, sem laço por iteração.
+    
+    As execuções se alternam entre sequências de sucessos e de falhas, cujos
+    comprimentos seguem distribuições geométricas: falhas consecutivas
+    ~ Geom(1 - prob_erro) e sucessos consecutivos ~ Geom(prob_erro), pois toda
+    sequência de sucessos após uma falha tem ao menos um sucesso. Só a primeira
+    sequência pode ser vazia (~ Geom(prob_erro) - 1). Basta sortear esses
+    comprimentos em lote e achar a primeira sequência de sucessos que chega a
+    `meta` ou de falhas que chega a `max_tentativas`. Os tempos de correção não
+    são simulados. Usa o laço original se o NumPy não estiver disponível ou se
+    o log por iteração (DEBUG) estiver ativo.
+    
+    Returns:
+        bool: True se o sistema executou 1000 vezes seguidas com sucesso.
+    """
+    if _NP_RNG is None or log.isEnabledFor(logging.DEBUG):
+        return executar_com_resiliencia(prob_erro=prob_erro, meta=meta, max_tentativas=max_tentativas)
+    
+    primeiro_lote = True
+    while True:
+        sucessos = _NP_RNG.geometric(prob_erro, lote)
+        falhas = _NP_RNG.geometric(1 - prob_erro, lote)
+        if primeiro_lote:
+            # A execução pode começar com uma falha
+            sucessos[0] -= 1
+            primeiro_lote = False
+        
+        # Em cada par, a sequência de sucessos vem antes da de falhas
+        concluiu = np.flatnonzero(sucessos >= meta)
+        interrompeu = np.flatnonzero(falhas >= max_tentativas)
+        primeiro_sucesso = concluiu[0] if concluiu.size else lote
+        primeira_falha = interrompeu[0] if interrompeu.size else lote
+        
+        if primeiro_sucesso < lote or primeira_falha < lote:
+            break
+    
+    if primeiro_sucesso <= primeira_falha:
+        log.info("Sistema executado com sucesso %d vezes!", meta)
+        return True
+    
+    log.warning("Muitas falhas consecutivas. Sistema interrompido.")
+    return False
+
+def verificar_modelo(ensaios=20000, prob_erro=0.4, meta=8, max_tentativas=3):
+    """Compara a taxa de sucesso da versão rápida com a do laço original.
+    
+    Usa limites pequenos para que ambas terminem rápido; os tempos de correção
+    não são simulados no laço original.
+    
+    Returns:
+        tuple: taxas de sucesso (laço original, versão rápida).
+    """
+    nivel = log.level
+    log.setLevel(logging.ERROR)
+    try:
+        laco = sum(executar_com_resiliencia(prob_erro=prob_erro, meta=meta, max_tentativas=max_tentativas,
+                                            simular_correcao=False)
+                   for _ in range(ensaios)) / ensaios
+        rapida = sum(executar_com_resiliencia_rapida(prob_erro=prob_erro, meta=meta, max_tentativas=max_tentativas)
+                     for _ in range(ensaios)) / ensaios
+    finally:
+        log.setLevel(nivel)
+    return laco, rapida
+
+def configurar_log(quiet=False):
+    """Envia o log para stdout em lotes de até 1000 mensagens.
+    
+    Avisos e erros forçam a gravação imediata do lote. Com quiet=True, as
+    mensagens por iteração (DEBUG) são descartadas.
+    """
+    saida = logging.StreamHandler(sys.stdout)
+    saida.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(logging.handlers.MemoryHandler(1000, flushLevel=logging.WARNING, target=saida))
+    log.setLevel(logging.INFO if quiet else logging.DEBUG)
 
 if __name__ == "__main__":
-    executar_com_resiliencia()
+    parser = argparse.ArgumentParser(description="Execução do sistema com mecanismo de resiliência")
+    parser.add_argument("--quiet", action="store_true", help="Exibe apenas o resultado final")
+    parser.add_argument("--verificar", action="store_true",
+                        help="Compara a versão rápida com o laço original usando limites pequenos")
+    args = parser.parse_args()
+    
+    configurar_log(args.quiet)
+    if args.verificar:
+        laco, rapida = verificar_modelo()
+        log.info("Taxa de sucesso - laço original: %.3f, versão rápida: %.3f", laco, rapida)
+    else:
+        executar_com_resiliencia_rapida()